@@ -0,0 +1,32 @@
+# Benchmark: local .cup generation from the taskData (replaces the round trip through the .cup converter)
+# Run from the project root: python -m benchmarks.cup_generation [num_points]
+# Also checks that the committed data/tasks/*.cup files (made by the converter on 2025-07-03) are reproduced byte for byte
+# (exits with an error if one is not)
+from benchmarks.sample_tasks import TASK_DIR, load_soaringspot_task, many_points_task
+from scripts import task_utils
+import timeit
+import sys
+import os
+
+COMMITTED_TASK_DATE = "2025-07-03"
+
+def main():
+    num_points = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    mismatches = []
+    for name in sorted(file[:-4] for file in os.listdir(TASK_DIR) if file.endswith('.cup')):
+        with open(os.path.join(TASK_DIR, f"{name}.cup"), "rb") as f:
+            golden = f.read()
+        cup_content = task_utils.build_task_cup(load_soaringspot_task(name), task_date=COMMITTED_TASK_DATE).encode('utf-8')
+        print(f"{name}.cup: identical to the committed file: {cup_content == golden}")
+        if cup_content != golden:
+            mismatches.append(f"{name}.cup")
+    if mismatches:
+        sys.exit(f"❌ Generated .cup differs from the committed file: {', '.join(mismatches)}")
+
+    task_data = many_points_task(num_points)
+    runs = 20
+    local_time = timeit.timeit(lambda: task_utils.build_task_cup(task_data), number=runs) / runs
+    print(f"{num_points} points: local .cup generation {local_time * 1000:.2f} ms (no request to the .cup converter)")
+
+if __name__ == "__main__":
+    main()
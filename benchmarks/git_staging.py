@@ -0,0 +1,79 @@
+# Benchmark: staging with "git add data/" + dirty scan vs. staging only the written paths
+# Run from the project root: python -m benchmarks.git_staging [profile_files]
+# Works in a throw-away repository with a populated (not ignored) browser profile below data/
+from scripts import git_utils
+from git import Repo
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+# Previous staging step of the commit helper
+def stage_data_dir(repo):
+    repo.git.add(["data/"])
+    return repo.is_dirty(index=True, working_tree=False, untracked_files=False)
+
+# New staging step (without the commit)
+def stage_written_paths(repo, paths):
+    paths = [os.path.relpath(path, repo.working_tree_dir) for path in paths]
+    repo.git.add("--", *paths)
+    return bool(repo.git.diff("--cached", "--name-only", "--", *paths))
+
+# Create a repository with task/glider files and a browser profile of the given size
+def create_sample_repo(root, profile_files):
+    repo = Repo.init(root)
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "benchmark")
+        writer.set_value("user", "email", "benchmark@example.com")
+    for directory, names in (("tasks", ("club.json", "club.tsk", "club.cup", "std.json", "std.tsk", "std.cup")), ("gliders", ("club.txt", "club.json", "std.txt", "std.json", "all.txt", "all.json"))):
+        os.makedirs(os.path.join(root, "data", directory))
+        for name in names:
+            with open(os.path.join(root, "data", directory, name), "w", encoding="utf-8") as f:
+                f.write(f"{name}\n")
+    repo.git.add(["data/"])
+    repo.index.commit("Initial files")
+
+    # Browser profiles hold many small files in nested folders (cache, storage, ...)
+    for idx in range(profile_files):
+        directory = os.path.join(root, "data", ".firefoxdriver_user_data", "cache2", "entries", f"{idx % 64:02x}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{idx:08x}"), "wb") as f:
+            f.write(os.urandom(64))
+    return repo
+
+def main():
+    profile_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    root = tempfile.mkdtemp(prefix="teamcaptain_git_")
+    try:
+        repo = create_sample_repo(root, profile_files)
+        changed_paths = [os.path.join(root, "data", "tasks", "club.tsk"), os.path.join(root, "data", "gliders", "club.txt")]
+        for path in changed_paths:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("changed\n")
+
+        start = time.perf_counter()
+        stage_written_paths(repo, changed_paths)
+        new_time = time.perf_counter() - start
+        repo.git.reset("-q")
+
+        start = time.perf_counter()
+        stage_data_dir(repo)
+        old_time = time.perf_counter() - start
+        staged_by_old = len(repo.git.diff("--cached", "--name-only").splitlines())
+        repo.git.reset("-q")
+
+        # With nothing written the publisher does not touch git at all
+        start = time.perf_counter()
+        git_utils.commit_task_and_glider_files(repo, [])
+        empty_time = time.perf_counter() - start
+
+        print(f"data/ with {profile_files} browser profile files:")
+        print(f"\tgit add data/ + is_dirty: {old_time * 1000:8.1f} ms ({staged_by_old} files staged)")
+        print(f"\tgit add <written paths>:  {new_time * 1000:8.1f} ms ({len(changed_paths)} files staged)")
+        print(f"\tno written paths:         {empty_time * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Benchmark: glider list line building (row-wise DataFrame.apply vs. vectorized string operations)
+# Run from the project root: python -m benchmarks.glider_list [num_pilots]
+from scripts import glider_utils
+import pandas as pd
+import numpy as np
+import timeit
+import sys
+
+# Previous row-wise builder, kept for comparison
+def build_glider_lines_with_apply(df):
+    df = df.copy()
+    df[['FlarmID', 'COMP', 'Flag', 'Name']] = df[['FlarmID', 'COMP', 'Flag', 'Name']].fillna('')
+    return df.apply(lambda row: f"{row['FlarmID']},,{row['Flag'] + ' ' if row['Flag'] else ''}{row['COMP']},{row['Flag'] + ' ' if row['Flag'] else ''}{row['Name']}", axis=1).tolist()
+
+# Synthetic pilot sheet with the columns of Database.xlsx (some pilots without flag, COMP or FLARM ID)
+def synthetic_pilot_sheet(num_pilots, seed=0):
+    rng = np.random.default_rng(seed)
+    flags = np.array(['🇨🇿', '🇩🇪', '🇫🇷', '🇵🇱', '🇸🇰', None], dtype=object)
+    comps = np.array(['OK', 'KT', '9B', 'E10', 'PP', None], dtype=object)
+    return pd.DataFrame({
+        'ID': np.arange(num_pilots),
+        'Class': rng.choice(['Club', 'Standard', '15m'], num_pilots),
+        'Name': [f"Pilot {idx} Šťastný" for idx in range(num_pilots)],
+        'Flag': flags[rng.integers(0, len(flags), num_pilots)],
+        'COMP': comps[rng.integers(0, len(comps), num_pilots)],
+        'FlarmID': [f"D{idx:05X}" if idx % 17 else None for idx in range(num_pilots)],
+    })
+
+def main():
+    num_pilots = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    df = synthetic_pilot_sheet(num_pilots)
+    runs = 5
+    old_time = timeit.timeit(lambda: build_glider_lines_with_apply(df), number=runs) / runs
+    new_time = timeit.timeit(lambda: glider_utils.build_glider_lines(glider_utils.build_glider_records(df)), number=runs) / runs
+    same = build_glider_lines_with_apply(df) == glider_utils.build_glider_lines(glider_utils.build_glider_records(df))
+    print(f"{num_pilots} pilots: apply {old_time * 1000:.1f} ms, vectorized {new_time * 1000:.1f} ms "
+          f"({old_time / new_time:.1f}x), identical output: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Benchmark: ODP to PDF conversion with a new soffice process each time (cold) vs. the warm UNO listener
+# Run from the project root: python -m benchmarks.libreoffice_conversion [odp_file] [runs]
+# Uses the latest weather briefing if no file is given; needs LibreOffice (and its "uno" module for the warm runs)
+from scripts import libreoffice_utils
+from scripts import weather_utils
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+# Convert a copy of the file a number of times, returns the duration of each conversion
+def time_conversions(convert, odp_path, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        convert(odp_path)
+        durations.append(time.perf_counter() - start)
+        os.remove(odp_path.replace('.odp', '.pdf'))
+    return durations
+
+def format_durations(durations):
+    return f"first {durations[0]:.2f} s, mean of the rest {sum(durations[1:]) / max(len(durations) - 1, 1):.2f} s"
+
+def main():
+    odp_file = sys.argv[1] if len(sys.argv) > 1 else weather_utils.get_latest_weather_briefing_fullPath()
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    if not os.path.exists(odp_file):
+        print(f"❌ ODP file '{odp_file}' not found.")
+        return
+    work_dir = tempfile.mkdtemp(prefix="teamcaptain_odp_")
+    try:
+        odp_path = os.path.join(work_dir, "briefing.odp")
+        shutil.copyfile(odp_file, odp_path)
+
+        cold = time_conversions(lambda path: libreoffice_utils.convert_with_subprocess(path, work_dir), odp_path, runs)
+        print(f"one-shot soffice:  {format_durations(cold)}")
+
+        if not libreoffice_utils.start_conversion_listener():
+            print("ℹ️  Warm listener not available (libreoffice_warm_conversion disabled or no 'uno' module).")
+            return
+        try:
+            # The first warm conversion includes the listener startup (done in the background when the briefing is opened)
+            warm = time_conversions(lambda path: libreoffice_utils.convert_with_listener(path, path.replace('.odp', '.pdf')), odp_path, runs)
+            print(f"warm UNO listener: {format_durations(warm)}")
+            print(f"speed-up after startup: {cold[-1] / warm[-1]:.1f}x")
+        finally:
+            libreoffice_utils.stop_conversion_listener()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Sample SoaringSpot task data for the benchmarks, rebuilt from the committed files in data/tasks
+from xml.etree.ElementTree import parse
+import numpy as np
+import json
+import os
+
+TASK_DIR = os.path.join('data', 'tasks')
+
+# Find the radian value that converts back to exactly the given degree value (as the generated files were written)
+def exact_radians(degrees):
+    radians = np.deg2rad(degrees)
+    for direction in (np.inf, -np.inf):
+        candidate = radians
+        for _ in range(8):
+            if np.rad2deg(candidate) == degrees:
+                return float(candidate)
+            candidate = np.nextafter(candidate, direction)
+    return float(radians)
+
+# Rebuild the SoaringSpot taskData of a committed task (e.g. 'club') from its .json and .tsk files
+def load_soaringspot_task(name):
+    with open(os.path.join(TASK_DIR, f"{name}.json"), "r", encoding='utf-8') as f:
+        glideandseek_task = json.load(f)
+    task = parse(os.path.join(TASK_DIR, f"{name}.tsk")).getroot()
+    tsk_points = task.findall('Point')
+
+    task_points = []
+    for point, tsk_point in zip(glideandseek_task['points'], tsk_points):
+        altitude = tsk_point.find('Waypoint').get('altitude')
+        task_points.append({
+            'type': 'point' if tsk_point.get('type') == 'Turn' else tsk_point.get('type').lower(),
+            'name': point['name'],
+            'elevation': float(altitude) if '.' in altitude else int(altitude),
+            'latitude': exact_radians(point['lat']),
+            'longitude': exact_radians(point['lng']),
+            'oz_radius1': point['radius'],
+        })
+    task_data = {
+        'task_type': 'assigned_area' if task.get('type') == 'AAT' else 'racing',
+        'task_points': task_points,
+    }
+    if task.get('aat_min_time'):
+        task_data['task_duration'] = int(task.get('aat_min_time'))
+    return task_data
+
+# Create a task with many points around Prievidza (turnpoints on a circle, AAT sectors)
+def many_points_task(num_points, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, num_points, endpoint=False)
+    task_points = []
+    for idx, angle in enumerate(angles):
+        point_type = 'start' if idx == 0 else 'finish' if idx == num_points - 1 else 'point'
+        task_points.append({
+            'type': point_type,
+            'name': f"{idx:03d}TP{idx}",
+            'elevation': int(rng.integers(150, 1200)),
+            'latitude': float(np.deg2rad(48.77 + 0.8 * np.sin(angle))),
+            'longitude': float(np.deg2rad(18.58 + 1.2 * np.cos(angle))),
+            'oz_radius1': 7500 if point_type == 'start' else 5000 if point_type == 'finish' else int(rng.integers(5, 40)) * 1000,
+        })
+    return {'task_type': 'assigned_area', 'task_duration': 10800, 'task_points': task_points}
+
+# Build a task page around the taskData payload, padded with markup like a real SoaringSpot page
+def build_task_page(task_data, filler_rows=400):
+    filler = ''.join(
+        f'<tr class="row"><td><a href="/en_gb/event/pilots/{idx}">Pilot {idx}</a></td><td>{idx * 37 % 1000} km</td><td>{idx % 60}:00</td></tr>\n'
+        for idx in range(filler_rows)
+    )
+    page = (
+        '<!DOCTYPE html>\n<html><head><title>Task</title>'
+        '<script>window.dataLayer = window.dataLayer || [];</script></head><body>\n'
+        f'<table class="task-overview">{filler}</table>\n'
+        '<script type="text/javascript">\n'
+        f'    var taskData = Map.SoaringSpot.taskNormalize({json.dumps(task_data)}, [{{"id": 1, "name": "Pilot"}}], {{"units": "metric"}});\n'
+        '    Map.SoaringSpot.init(taskData);\n'
+        '</script>\n'
+        f'<table class="footer">{filler}</table>\n</body></html>\n'
+    )
+    return page.encode('utf-8')
+
+# Minimal stand-in for a requests.Response holding a page
+class PageResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.text = content.decode('utf-8')
@@ -0,0 +1,42 @@
+# Benchmark: import time of the menu and time until the main menu is shown
+# Run from the project root: python -m benchmarks.startup [runs]
+# Every measurement runs in a fresh interpreter, so nothing is cached in sys.modules
+import subprocess
+import statistics
+import time
+import sys
+
+# Modules the menu used to import at startup (everything the actions need)
+ALL_MODULES = ["scripts.task_utils", "scripts.glider_utils", "scripts.browser_utils", "scripts.whatsapp_utils", "scripts.git_utils", "scripts.menu_utils"]
+
+# Import time of the given modules in a fresh interpreter, in seconds
+def import_time(modules):
+    code = f"import time; start = time.perf_counter(); import {', '.join(modules)}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+# Time from starting teamcaptain.py until the main menu asks for a choice, in seconds
+def time_to_menu():
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-u", "teamcaptain.py"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding="utf-8")
+    try:
+        for line in process.stdout:
+            if line.startswith("Q. Quit"):
+                return time.perf_counter() - start
+        raise RuntimeError("teamcaptain.py exited before showing the menu")
+    finally:
+        process.kill()
+        process.wait()
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    menu_imports = [import_time(["scripts.menu_utils"]) for _ in range(runs)]
+    all_imports = [import_time(ALL_MODULES) for _ in range(runs)]
+    menu_times = [time_to_menu() for _ in range(runs)]
+    print(f"median of {runs} runs:")
+    print(f"\timport scripts.menu_utils: {statistics.median(menu_imports) * 1000:7.1f} ms")
+    print(f"\timport all action modules: {statistics.median(all_imports) * 1000:7.1f} ms (loaded on first use)")
+    print(f"\ttime to menu:              {statistics.median(menu_times) * 1000:7.1f} ms (task IDs load in the background)")
+
+if __name__ == "__main__":
+    main()
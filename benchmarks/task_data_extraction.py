@@ -0,0 +1,68 @@
+# Benchmark: taskData extraction from a SoaringSpot task page (BeautifulSoup version vs. marker scan)
+# Run from the project root: python -m benchmarks.task_data_extraction [saved_task_page.html ...]
+from benchmarks.sample_tasks import load_soaringspot_task, build_task_page, PageResponse
+from scripts import task_utils
+from bs4 import BeautifulSoup
+import tracemalloc
+import timeit
+import html
+import json
+import sys
+import re
+
+# Previous extractor (full html.parser tree, non-greedy regex and ', [{' cut), kept for comparison
+def extract_json_with_beautifulsoup(html_response):
+    soup = BeautifulSoup(html_response.content, 'html.parser')
+    script_tag = soup.find('script', string=re.compile(r'var taskData'))
+    if not script_tag:
+        return None
+    match = re.search(r'var taskData = Map\.SoaringSpot\.taskNormalize\((\{.*?\})\);', script_tag.string, re.DOTALL)
+    if not match:
+        return None
+    raw_str = match.group(1).strip()
+    end_idx = raw_str.find(', [{')
+    if end_idx != -1:
+        raw_str = raw_str[:end_idx]
+    try:
+        return json.loads(html.unescape(raw_str))
+    except json.JSONDecodeError:
+        return None
+
+# Peak memory allocated by one call
+def peak_allocation(func, response):
+    tracemalloc.start()
+    func(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    if len(sys.argv) > 1:
+        pages = {}
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                pages[path] = f.read()
+    else:
+        pages = {f"{name} (rebuilt)": build_task_page(load_soaringspot_task(name)) for name in ('club', 'std')}
+
+    print(f"{'page':<24}{'size':>10}{'old ms':>10}{'new ms':>10}{'old peak':>12}{'new peak':>12}  same result")
+    for label, content in pages.items():
+        response = PageResponse(content)
+        runs = 20
+        old_time = timeit.timeit(lambda: extract_json_with_beautifulsoup(response), number=runs) / runs
+        new_time = timeit.timeit(lambda: task_utils.extract_json_from_html(response), number=runs) / runs
+        old_peak = peak_allocation(extract_json_with_beautifulsoup, response)
+        new_peak = peak_allocation(task_utils.extract_json_from_html, response)
+        same = extract_json_with_beautifulsoup(response) == task_utils.extract_json_from_html(response)
+        print(f"{label:<24}{len(content) / 1024:>8.1f}kB{old_time * 1000:>10.2f}{new_time * 1000:>10.2f}"
+              f"{old_peak / 1024:>10.0f}kB{new_peak / 1024:>10.0f}kB  {same}")
+
+    # A turnpoint name containing ', [{' cuts the old extractor's JSON in half
+    task_data = load_soaringspot_task('club')
+    task_data['task_points'][1]['name'] = 'LUCIVNA, [{airfield}]'
+    response = PageResponse(build_task_page(task_data))
+    print(f"\n', [{{' inside a string: old extractor {'ok' if extract_json_with_beautifulsoup(response) == task_data else 'FAILED'}, "
+          f"new extractor {'ok' if task_utils.extract_json_from_html(response) == task_data else 'FAILED'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Benchmark: task geometry for tasks with many points (per-point scalar loop vs. vectorized geometry_utils)
+# Run from the project root: python -m benchmarks.task_geometry [num_points ...]
+# First checks the AAT min/max distances against a brute-force search (exits with an error on a mismatch)
+from benchmarks.sample_tasks import load_soaringspot_task, many_points_task
+from scripts import geometry_utils
+import numpy as np
+import timeit
+import math
+import sys
+
+# Per-point version (NumPy scalar conversions and a Python loop over the legs), kept for comparison
+def scalar_geometry(task_points):
+    latitudes = [float(np.rad2deg(point['latitude'])) for point in task_points]
+    longitudes = [float(np.rad2deg(point['longitude'])) for point in task_points]
+    legs = []
+    for first, second in zip(task_points, task_points[1:]):
+        a = (math.sin((second['latitude'] - first['latitude']) / 2) ** 2
+             + math.cos(first['latitude']) * math.cos(second['latitude']) * math.sin((second['longitude'] - first['longitude']) / 2) ** 2)
+        legs.append(2 * geometry_utils.EARTH_RADIUS * math.asin(math.sqrt(min(a, 1.0))))
+    return latitudes, longitudes, legs
+
+# Two-area AAT tasks (lat, lng in degrees, radius in meters) where the areas overlap or contain the start or finish
+BRUTE_FORCE_TASKS = {
+    "overlapping areas": [(48.0, 18.0, 0), (48.3, 18.3, 30000), (48.35, 18.25, 30000), (48.0, 18.2, 0)],
+    "overlapping areas along the route": [(48.0, 18.0, 0), (48.4, 18.5, 30000), (48.45, 18.7, 30000), (48.1, 18.9, 0)],
+    "start inside both areas": [(48.0, 18.0, 0), (48.1, 18.0, 30000), (48.05, 18.1, 30000), (48.02, 18.02, 0)],
+    "finish inside an area": [(48.0, 18.0, 0), (48.5, 18.4, 20000), (48.2, 18.9, 25000), (48.25, 18.8, 0)],
+    "separate areas": [(48.0, 18.0, 0), (48.6, 18.2, 20000), (48.3, 19.0, 40000), (48.05, 18.1, 0)],
+}
+BRUTE_FORCE_TOLERANCE = 50.0
+
+# Points spread over an area (polar grid including the center and the edge)
+def area_grid(lat, lng, radius, angles=180, rings=30):
+    angle, ring = np.meshgrid(np.linspace(0, 2 * np.pi, angles, endpoint=False), np.linspace(0, 1, rings))
+    distance = radius * np.sqrt(ring.ravel())
+    return lat + distance * np.cos(angle.ravel()) / geometry_utils.EARTH_RADIUS, lng + distance * np.sin(angle.ravel()) / (geometry_utils.EARTH_RADIUS * np.cos(lat))
+
+# Shortest and longest route length of a two-area task over all combinations of grid points
+def brute_force_min_max(lat, lng, radius):
+    first_lat, first_lng = area_grid(lat[1], lng[1], radius[1])
+    second_lat, second_lng = area_grid(lat[2], lng[2], radius[2])
+    lengths = (geometry_utils.great_circle_distances(lat[0], lng[0], first_lat, first_lng)[:, None]
+               + geometry_utils.great_circle_distances(first_lat[:, None], first_lng[:, None], second_lat[None, :], second_lng[None, :])
+               + geometry_utils.great_circle_distances(second_lat, second_lng, lat[3], lng[3])[None, :])
+    return lengths.min(), lengths.max()
+
+# Check that a route keeps its turn points inside the areas (in the local plane of each area, like place_on_cylinder)
+def inside_areas(lat, lng, route_lat, route_lng, radius):
+    east, north = geometry_utils.local_offsets(route_lat, route_lng, lat, lng)
+    return bool(np.all(np.hypot(east, north)[1:-1] <= radius[1:-1] + 1.0))
+
+# Compare the AAT min/max with the brute-force search, returns False if any task does not match
+def check_against_brute_force():
+    all_ok = True
+    for name, points in BRUTE_FORCE_TASKS.items():
+        lat, lng = np.deg2rad([point[0] for point in points]), np.deg2rad([point[1] for point in points])
+        radius = np.array([point[2] for point in points], dtype=float)
+        shortest = geometry_utils.shortest_aat_route(lat, lng, radius)
+        longest = geometry_utils.longest_aat_route(lat, lng, radius)
+        min_distance, max_distance = geometry_utils.leg_lengths(*shortest).sum(), geometry_utils.leg_lengths(*longest).sum()
+        brute_min, brute_max = brute_force_min_max(lat, lng, radius)
+        # Routes inside the areas can not beat the true optimum, so only the side the grid search can prove is checked
+        ok = (inside_areas(lat, lng, *shortest, radius) and inside_areas(lat, lng, *longest, radius)
+              and min_distance <= brute_min + BRUTE_FORCE_TOLERANCE and max_distance >= brute_max - BRUTE_FORCE_TOLERANCE)
+        all_ok = all_ok and ok
+        print(f"{'✅' if ok else '❌'} {name}: min {min_distance / 1000:.3f} km (brute force {brute_min / 1000:.3f} km), "
+              f"max {max_distance / 1000:.3f} km (brute force {brute_max / 1000:.3f} km)")
+    return all_ok
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 10000]
+    if not check_against_brute_force():
+        sys.exit("❌ AAT min/max distances do not match the brute-force search")
+    for name in ('club', 'std'):
+        geometry = geometry_utils.task_geometry(load_soaringspot_task(name)['task_points'])
+        print(f"{name}: {geometry_utils.format_task_distance(geometry)}")
+
+    for num_points in counts:
+        task_points = many_points_task(num_points)['task_points']
+        runs = max(1, 2000 // num_points)
+        old_time = timeit.timeit(lambda: scalar_geometry(task_points), number=runs) / runs
+        new_time = timeit.timeit(lambda: geometry_utils.task_geometry(task_points), number=runs) / runs
+        aat_time = timeit.timeit(lambda: geometry_utils.task_geometry(task_points, aat=True), number=1)
+        latitudes, longitudes, legs = scalar_geometry(task_points)
+        geometry = geometry_utils.task_geometry(task_points, aat=True)
+        same = latitudes == geometry['latitudes'] and longitudes == geometry['longitudes'] and np.allclose(legs, geometry['legs'], rtol=0, atol=1e-6)
+        print(f"{num_points} points: coordinates + legs scalar {old_time * 1000:.2f} ms, vectorized {new_time * 1000:.2f} ms "
+              f"({old_time / new_time:.1f}x, same result: {same}); with AAT min/max {aat_time * 1000:.1f} ms "
+              f"({geometry_utils.format_task_distance(geometry)})")
+
+if __name__ == "__main__":
+    main()
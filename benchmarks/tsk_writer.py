@@ -0,0 +1,76 @@
+# Benchmark: .tsk writing (ElementTree + minidom pretty-print round trip vs. direct element-by-element writer)
+# Run from the project root: python -m benchmarks.tsk_writer [num_points]
+# Also checks that the committed data/tasks/*.tsk files are reproduced byte for byte (exits with an error if one is not)
+from benchmarks.sample_tasks import TASK_DIR, load_soaringspot_task, many_points_task
+from xml.etree.ElementTree import Element, SubElement, tostring
+from scripts import task_utils
+from scripts import config
+from xml.dom import minidom
+import numpy as np
+import contextlib
+import tempfile
+import timeit
+import shutil
+import sys
+import io
+import os
+
+# Previous .tsk serialization, kept for comparison
+def tsk_with_minidom(json_data):
+    if str(json_data['task_type']) == 'assigned_area':
+        task = Element('Task', aat_min_time=str(json_data['task_duration']), type='AAT')
+    else:
+        task = Element('Task', type='RT')
+    for point in json_data.get('task_points', []):
+        point_type = point['type'].capitalize() if point['type'] != 'point' else 'Turn'
+        point_elem = SubElement(task, 'Point', type=point_type)
+        wp_elem = SubElement(point_elem, 'Waypoint', altitude=str(point['elevation']), name=point['name'])
+        SubElement(wp_elem, 'Location', latitude=str(np.rad2deg(point['latitude'])), longitude=str(np.rad2deg(point['longitude'])))
+        if point_type == 'Start':
+            SubElement(point_elem, 'ObservationZone', length=str(2*point['oz_radius1']), type="Line")
+        else:
+            SubElement(point_elem, 'ObservationZone', radius=str(point['oz_radius1']), type="Cylinder")
+    pretty_xml = minidom.parseString(tostring(task, 'utf-8')).toprettyxml(indent="  ")
+    return '\n'.join(pretty_xml.split('\n')[1:])
+
+# Write a .tsk file with the current writer and return its content
+def tsk_with_writer(json_data, name="benchmark"):
+    with contextlib.redirect_stdout(io.StringIO()):
+        filepath = task_utils.create_task_tsk_file(json_data, name)
+    with open(filepath, "r", encoding="utf-8") as f:
+        return f.read()
+
+def main():
+    num_points = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    output_dir = config.task_output_dir
+    config.task_output_dir = tempfile.mkdtemp(prefix="teamcaptain_tsk_")
+    mismatches = []
+    try:
+        # Golden files: the committed .tsk files must come out unchanged
+        for name in sorted(file[:-4] for file in os.listdir(TASK_DIR) if file.endswith('.tsk')):
+            with open(os.path.join(TASK_DIR, f"{name}.tsk"), "r", encoding="utf-8") as f:
+                golden = f.read()
+            task_data = load_soaringspot_task(name)
+            identical = tsk_with_writer(task_data, name) == golden
+            print(f"{name}.tsk: identical to the committed file: {identical}, "
+                  f"identical to minidom: {tsk_with_minidom(task_data) == golden}")
+            if not identical:
+                mismatches.append(f"{name}.tsk")
+
+        task_data = many_points_task(num_points)
+        runs = 20
+        old_time = timeit.timeit(lambda: tsk_with_minidom(task_data), number=runs) / runs
+        new_time = timeit.timeit(lambda: tsk_with_writer(task_data), number=runs) / runs
+        same = tsk_with_minidom(task_data) == tsk_with_writer(task_data)
+        print(f"{num_points} points: minidom {old_time * 1000:.2f} ms, direct writer {new_time * 1000:.2f} ms "
+              f"({old_time / new_time:.1f}x), identical output: {same}")
+        if not same:
+            mismatches.append(f"{num_points}-point task (differs from minidom)")
+    finally:
+        shutil.rmtree(config.task_output_dir, ignore_errors=True)
+        config.task_output_dir = output_dir
+    if mismatches:
+        sys.exit(f"❌ .tsk writer output differs: {', '.join(mismatches)}")
+
+if __name__ == "__main__":
+    main()
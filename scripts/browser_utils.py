@@ -1,9 +1,13 @@
 from scripts import config
+from scripts import url_utils
+from scripts import utils
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
 from selenium import webdriver
 import psutil
+import atexit
 import sys
 import os
 
@@ -54,17 +58,97 @@ def close_chrome_with_userdata(chromedriver_user_data_dir):
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
 
-def close_windows():
+# Return a warm browser session for the given purpose (e.g. "tabs:0", "whatsapp")
+# Sessions are reused if they still respond, crashed ones are replaced by a new browser
+def acquire_driver(purpose, userData=False, runHeadless=False, whatsAppBrowser=False):
+    driver = config.driver_pool.get(purpose)
+    if driver is not None:
+        if is_driver_alive(driver):
+            reset_driver(driver)
+            unpark_driver(driver)
+            if whatsAppBrowser:
+                config.whatsapp_driver = driver
+            elif driver not in config.all_drivers:
+                config.all_drivers.append(driver)
+            return driver
+        print(f"⚠️  Browser session '{purpose}' is not responding, starting a new one")
+        quit_driver(driver)
+    driver = open_browser(userData, runHeadless, whatsAppBrowser)
+    config.driver_pool[purpose] = driver
+    return driver
+
+# Check whether a browser session still responds
+def is_driver_alive(driver):
+    try:
+        return len(driver.window_handles) > 0
+    except Exception:
+        return False
+
+# Bring a session back to a single blank tab so it can be handed out again
+def reset_driver(driver):
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.get("about:blank")
+
+# Empty a warm session and minimise its window, so no blank browser windows stay on the screen
+def park_driver(driver):
+    reset_driver(driver)
+    config.parked_window_rects[driver] = driver.get_window_rect()
+    driver.minimize_window()
+
+# Bring a minimised warm session back to its previous position and size
+def unpark_driver(driver):
+    rect = config.parked_window_rects.pop(driver, None)
+    if rect:
+        driver.set_window_rect(**rect)
+
+# Quit a browser session and forget about it
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    for purpose, pooled_driver in list(config.driver_pool.items()):
+        if pooled_driver is driver:
+            del config.driver_pool[purpose]
+    config.parked_window_rects.pop(driver, None)
+    if driver in config.all_drivers:
+        config.all_drivers.remove(driver)
+    if config.whatsapp_driver is driver:
+        config.whatsapp_driver = None
+
+# Quit the minimised warm sessions (their windows were already closed by the user, only the browser processes are left)
+def quit_parked_drivers():
+    for driver in list(config.parked_window_rects):
+        quit_driver(driver)
+
+# The parked sessions are not visible and hold the browser profiles (e.g. WhatsApp's), so they are always ended on exit
+atexit.register(quit_parked_drivers)
+
+# Close all browser windows (pooled sessions are only emptied, minimised and kept warm, unless quit_sessions is set)
+def close_windows(quit_sessions=False):
     print("⚠️  Closing all browser windows...")
-    # Close all tracked browser windows
+    keep_warm = config.keep_browser_sessions_warm and not quit_sessions
+    drivers = list(getattr(config, "all_drivers", []))
+    if quit_sessions:
+        drivers += [driver for driver in config.driver_pool.values() if driver not in drivers]
     closed = 0
-    for driver in getattr(config, "all_drivers", []):
-        try:
-            driver.quit()
-            closed += 1
-        except Exception:
-            pass
-    if closed:
+    for driver in drivers:
+        if keep_warm and driver in config.driver_pool.values() and is_driver_alive(driver):
+            try:
+                park_driver(driver)
+                closed += 1
+                continue
+            except Exception:
+                pass
+        quit_driver(driver)
+        closed += 1
+    if closed and keep_warm:
+        print(f"✅ Closed the tabs of {closed} browser window(s), the emptied windows are minimised and kept for reuse.")
+    elif closed:
         print(f"✅ Closed {closed} browser process(es).")
     else:
         print("ℹ️  No browser processes found.")
@@ -72,8 +156,12 @@ def close_windows():
 
 def close_whatsapp_driver():
     try:
-        config.whatsapp_driver.quit()
-        config.whatsapp_driver = None
+        # A pooled WhatsApp session stays logged in (minimised) for the next send
+        if config.keep_browser_sessions_warm and config.whatsapp_driver in config.driver_pool.values():
+            park_driver(config.whatsapp_driver)
+            config.whatsapp_driver = None
+        else:
+            quit_driver(config.whatsapp_driver)
     except:
         print("❌ Failed to close the browser config.whatsapp_driver. Something really went wrong.")
 
@@ -99,115 +187,55 @@ def open_tabs():
     print("⚙️  Opening browser tabs from URL file...")
 
     try:
-        win_urls = {}  # {window_number: [url1, url2, ...]}
-        with open(config.url_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if line.startswith("{WIN:"):
-                    try:
-                        win_part, url = line.split("}", 1)
-                        url = url.strip()
-                        win_key = win_part.replace("{WIN:", "")
-                        if win_key == "I":
-                            # {WIN:I} - one window per class
-                            github_path = getattr(config, "github_path", "")
-                            base_replacements = {"{gitHubPath}": github_path}
-                            if any(ph in url for ph in ("{taskID}", "{classURL}", "{classFile}")):
-                                for class_name in config.classes:
-                                    task_id = config.selected_task_ids.get(class_name, "")
-                                    class_url = config.url_map.get(class_name, "")
-                                    file_url = config.filename_map.get(class_name, "")
-                                    if not all([task_id, class_url, file_url]):
-                                        continue
-                                    replacements = {
-                                        **base_replacements,
-                                        "{taskID}": task_id,
-                                        "{classURL}": class_url,
-                                        "{classFile}": file_url,
-                                    }
-                                    url_filled = url
-                                    for key, value in replacements.items():
-                                        url_filled = url_filled.replace(key, value)
-                                    # Use a unique window number for each class window
-                                    win_urls.setdefault(f"I_{class_name}", []).append(url_filled)
-                            else:
-                                # If no class placeholders, treat as a normal window
-                                win_urls.setdefault("I", []).append(url)
-                        else:
-                            win_num = int(win_key)
-                            github_path = getattr(config, "github_path", "")
-                            base_replacements = {"{gitHubPath}": github_path}
-                            if any(ph in url for ph in ("{taskID}", "{classURL}", "{classFile}")):
-                                for class_name in config.classes:
-                                    task_id = config.selected_task_ids.get(class_name, "")
-                                    class_url = config.url_map.get(class_name, "")
-                                    file_url = config.filename_map.get(class_name, "")
-                                    if not all([task_id, class_url, file_url]):
-                                        continue
-                                    replacements = {
-                                        **base_replacements,
-                                        "{taskID}": task_id,
-                                        "{classURL}": class_url,
-                                        "{classFile}": file_url,
-                                    }
-                                    url_filled = url
-                                    for key, value in replacements.items():
-                                        url_filled = url_filled.replace(key, value)
-                                    win_urls.setdefault(win_num, []).append(url_filled)
-                            else:
-                                url_filled = url
-                                for key, value in base_replacements.items():
-                                    url_filled = url_filled.replace(key, value)
-                                win_urls.setdefault(win_num, []).append(url_filled)
-                    except Exception:
-                        print(f"❌ URL '{line}' has an invalid window ID.")
-                        continue
-                else:
-                    # No {WIN:} - default to window 0
-                    url = line
-                    github_path = getattr(config, "github_path", "")
-                    base_replacements = {"{gitHubPath}": github_path}
-                    if any(ph in url for ph in ("{taskID}", "{classURL}", "{classFile}")):
-                        for class_name in config.classes:
-                            task_id = config.selected_task_ids.get(class_name, "")
-                            class_url = config.url_map.get(class_name, "")
-                            file_url = config.filename_map.get(class_name, "")
-                            if not all([task_id, class_url, file_url]):
-                                continue
-                            replacements = {
-                                **base_replacements,
-                                "{taskID}": task_id,
-                                "{classURL}": class_url,
-                                "{classFile}": file_url,
-                            }
-                            url_filled = url
-                            for key, value in replacements.items():
-                                url_filled = url_filled.replace(key, value)
-                            win_urls.setdefault(0, []).append(url_filled)
-                    else:
-                        url_filled = url
-                        for key, value in base_replacements.items():
-                            url_filled = url_filled.replace(key, value)
-                        win_urls.setdefault(0, []).append(url_filled)
+        # Step 1: Expand the (compiled) URL file for all classes
+        win_urls = url_utils.expand_url_file(config.url_file)
 
         # Step 2: Open each window and load its URLs (each URL in a new tab in that window)
-        first_window = True
-        for win_num in win_urls:
-            first_tab = True
-            urls = win_urls[win_num]
-
-            if first_window:
-                config.driver = open_browser(True, False, False)
-                first_window = False
-                for url in urls:
-                    first_tab = open_tab(config.driver, url, first_tab)
-            else:
-                driver = open_browser(None, False, False)
-                for url in urls:
-                    first_tab = open_tab(driver, url, first_tab)
+        if config.open_tabs_concurrently:
+            open_windows_concurrently(win_urls)
+        else:
+            for idx, win_num in enumerate(win_urls):
+                driver = open_window(win_urls[win_num], idx)
+                if idx == 0:
+                    config.driver = driver
             
         print("✅ Browser tabs opened successfully.")
     except Exception as e:
-        print(f"❌ Error opening browser tabs: {e}")
\ No newline at end of file
+        print(f"❌ Error opening browser tabs: {e}")
+
+# Open the browser window with the given index and load its URLs, each in its own tab (only the first window uses the user data profile)
+def open_window(urls, idx):
+    if config.keep_browser_sessions_warm:
+        driver = acquire_driver(f"tabs:{idx}", idx == 0, False, False)
+    else:
+        driver = open_browser(True if idx == 0 else None, False, False)
+    first_tab = True
+    for url in urls:
+        first_tab = open_tab(driver, url, first_tab)
+    return driver
+
+# Start the browser sessions of all tab windows ahead of time (kept in the pool, open_tabs then only loads the URLs)
+def prelaunch_tab_browsers():
+    if not config.keep_browser_sessions_warm or not os.path.exists(config.url_file):
+        return
+    window_count = len(url_utils.expand_url_file(config.url_file))
+    print(f"⚙️  Starting {window_count} browser window(s)...")
+    workers = max(min(window_count, config.browser_startup_workers), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda idx: acquire_driver(f"tabs:{idx}", idx == 0, False, False), range(window_count)))
+    print(f"✅ {window_count} browser window(s) started.")
+
+# Start all browser windows at the same time, a window that fails does not stop the others
+def open_windows_concurrently(win_urls):
+    win_nums = list(win_urls)
+    workers = max(min(len(win_nums), config.browser_startup_workers), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(utils.run_with_buffered_output, open_window, win_urls[win_num], idx) for idx, win_num in enumerate(win_nums)]
+        # Report in window order, whichever window finished first
+        for idx, (win_num, future) in enumerate(zip(win_nums, futures)):
+            output, driver, error = future.result()
+            print(output, end="")
+            if error:
+                print(f"❌ Could not open browser window '{win_num}': {error}")
+            elif idx == 0:
+                config.driver = driver
@@ -45,10 +45,20 @@ whatsapp_message = "Chatty ist der Beste! Hier ist die heutige Wettervorhersage
 # WhatsApp group name to send the weather briefing to (Emojis are not allowed in the string here, but may be included in the actual group name! Looking for the closes match!)
 whatsapp_group = 'Junioren EM'
 
-# WhatsApp timeout for sending the message. This is the time the app waits between adding the presentation to the chat and closing the window
-# Increase time if internet connection is weak or file is large
+# WhatsApp groups to send the weather briefing to, each with its own caption (all sent in one WhatsApp Web session)
+whatsapp_groups = [
+    {'group': whatsapp_group, 'message': whatsapp_message},
+]
+
+# Minimum match score for the group name (1.0 = identical, above 1.0 = group name contained in the chat title)
+whatsapp_group_min_score = 0.8
+
+# WhatsApp timeout for loading WhatsApp Web and each step of the send (search, attach, caption)
 whatsapp_timeout = 30
-whatsapp_group_send_time = 15
+
+# Maximum time to wait for the upload to finish and the message to show as sent before giving up
+# Increase time if internet connection is weak or file is large
+whatsapp_send_timeout = 120
 
 # =========================
 # Git, Browser, and LibreOffice Settings
@@ -57,15 +67,37 @@ whatsapp_group_send_time = 15
 # Path to github repo
 github_path = "FerreiraNuno/teamcaptain-scripts"
 
+# Background publishing: wait this long for more updates before committing, then retry failed commits and pushes with backoff
+publish_coalesce_delay = 2
+publish_max_retries = 4
+publish_retry_backoff = 5
+
+# Day preparation: maximum time the tabs wait for the updated task and glider files to be pushed
+day_preparation_publish_timeout = 120
+
 # Set up your git credentials if not already configured
 os.environ['GIT_SSH_COMMAND'] = 'ssh -i ~/.ssh/id_rsa'
 
 # Path to the LibreOffice executable (adjust if needed)
 soffice_path = r"C:\Program Files\LibreOffice\program\soffice.exe"
 
+# Keep a headless LibreOffice listening on a local UNO socket for ODP to PDF conversions (avoids the startup of a new soffice each time)
+# Needs the "uno" Python module of LibreOffice, falls back to a one-shot "soffice --convert-to pdf" if the listener is not available
+libreoffice_warm_conversion = True
+libreoffice_listener_port = 2002
+libreoffice_listener_timeout = 30
+
 # scripts/config.py
 browser = "firefox"  # "chrome" or "firefox" 
 
+# Start the browser windows from the URL file in parallel (each window is a separate browser process)
+open_tabs_concurrently = True
+browser_startup_workers = 6
+
+# Keep browser sessions running after closing their tabs, so re-opening tabs or WhatsApp does not start a new browser
+# (the emptied windows are minimised until they are used again)
+keep_browser_sessions_warm = True
+
 # =========================
 # File Locations
 # =========================
@@ -90,22 +122,49 @@ weather_briefing_path = os.path.join('externals', 'metbrief', 'briefings', comp_
 # Directory for generated task files
 task_output_dir = 'data/tasks'
 
+# Manifest of the task ID and taskData hash each class's task files were last generated from
+task_manifest_path = os.path.join(task_output_dir, '.manifest.json')
+
 # Directory for generated glider files
 glider_output_dir = 'data/gliders'
 
+# Manifest of the record hashes each class's glider files were last generated from
+glider_manifest_path = os.path.join(glider_output_dir, '.manifest.json')
+
 # Directory for Chrome user data (used by Selenium)
 chromedriver_user_data_dir = 'data/.chromedriver_user_data'
 
 # Directory for Chrome user data (used by Selenium)
 firefoxdriver_user_data_dir = 'data/.firefoxdriver_user_data'
 
+# Directory for the LibreOffice profile of the conversion listener (separate, so it does not take over opened briefings)
+libreoffice_user_data_dir = 'data/.libreoffice_user_data'
+
 # =========================
 # SoaringSpot & CUP Download
 # =========================
 
-# URL for downloading .cup files from SoaringSpot links
+# URL of the .cup converter for SoaringSpot links (.cup files are generated locally, the converter is only a fallback)
 cup_url = 'https://xlxjz3geasj4wiei7n5vzt7zzu0qibmm.lambda-url.eu-central-1.on.aws/?url='
 
+# Download the .cup file from the converter if it cannot be generated locally
+cup_converter_fallback = True
+
+# =========================
+# HTTP Settings
+# =========================
+
+# (connect, read) timeout in seconds for every request to SoaringSpot and the .cup converter
+http_timeout = (5, 20)
+
+# Number of retries on 5xx responses and connection errors (waits http_backoff * 2^attempt seconds, jittered)
+http_max_retries = 3
+http_backoff = 0.5
+
+# Keep-alive connection pool: number of hosts kept and maximum connections per host
+http_pool_hosts = 4
+http_pool_maxsize = 4
+
 # =========================
 # Shared State Variables
 # =========================
@@ -113,11 +172,51 @@ cup_url = 'https://xlxjz3geasj4wiei7n5vzt7zzu0qibmm.lambda-url.eu-central-1.on.a
 # Dictionary to store selected task IDs for each class
 selected_task_ids = {}
 
+# State of the background task ID discovery at startup (shown in the menu)
+task_id_status = {'state': 'idle', 'error': None}
+
+# Parsed Database.xlsx, keyed on the file's modification time and size
+glider_database_cache = {}
+
+# Compiled URL file (window keys and pre-split URL segments), keyed on the file's modification time
+url_template_cache = {}
+
+# Conditional request state of the SoaringSpot results page (ETag, Last-Modified, body hash, parsed task IDs)
+results_poll_state = {}
+
+# Conditional request state of the task page of each class, kept while the page matches the written task files
+# (task ID, taskData hash, ETag, Last-Modified)
+task_page_validators = {}
+
+# Task pages of republished tasks downloaded by the change check, reused by the following task file update
+task_page_cache = {}
+
+# Shared keep-alive HTTP session (created on first use by http_utils) and its counters
+http_session = None
+http_stats = {'requests': 0, 'handshakes_avoided': 0, 'retries': 0}
+
+# Headless LibreOffice conversion listener (process) and the UNO desktop connected to it
+libreoffice_listener = None
+libreoffice_desktop = None
+
 # Whether to automatically commit and push to git after updates
 commit_and_push_to_git = True
 
+# State of the background git publish worker (shown in the menu)
+# (uncommitted: paths whose commit failed, they are committed with the next request)
+publish_status = {'state': 'idle', 'pending': 0, 'uncommitted': set(), 'unpushed': False, 'retries': 0, 'last_publish': None, 'last_latency': None, 'last_error': None}
+
 # UserData Driver (there can only be one in chrome)
 whatsapp_driver = None
 
+# WhatsApp chat title resolved for each configured group name (reused on later sends)
+whatsapp_chat_cache = {}
+
 # All browser drivers
-all_drivers = []
\ No newline at end of file
+all_drivers = []
+
+# Warm browser sessions by purpose ("tabs:0", "tabs:1", ..., "whatsapp")
+driver_pool = {}
+
+# Window position and size of the minimised warm sessions, restored when they are handed out again
+parked_window_rects = {}
\ No newline at end of file
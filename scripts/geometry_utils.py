@@ -0,0 +1,179 @@
+# Import necessary libraries
+import numpy as np
+
+# Mean earth radius in meters (FAI sphere)
+EARTH_RADIUS = 6371000.0
+
+# Maximum number of iterations and the movement (meters) below which the AAT optimisation of the longest route stops
+# (real tasks need a handful of iterations, only long chains of overlapping areas reach the limit)
+AAT_MAX_ITERATIONS = 100
+AAT_TOLERANCE = 1.0
+
+# Shortest route: legs are smoothed to sqrt(length^2 + s^2), s shrinks over these steps (meters), each with at most this many iterations
+AAT_SMOOTHING_STEPS = (1000.0, 100.0, 10.0, 1.0)
+AAT_MAX_GRADIENT_ITERATIONS = 3000
+
+# Longest route: number of points on the edge of each area the route is first chosen from (then refined)
+AAT_EDGE_POINTS = 36
+
+# Coordinates of the task points in radians (as SoaringSpot stores them)
+def radian_coordinates(task_points):
+    return np.array([point['latitude'] for point in task_points], dtype=float), np.array([point['longitude'] for point in task_points], dtype=float)
+
+# Coordinates of the task points in degrees (lists of floats), converted all at once
+def degree_coordinates(task_points):
+    lat, lng = radian_coordinates(task_points)
+    return np.rad2deg(lat).tolist(), np.rad2deg(lng).tolist()
+
+# Great-circle distances in meters between arrays of points given in radians (haversine)
+def great_circle_distances(lat1, lng1, lat2, lng2):
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+# Lengths of the legs of a route in meters (points in radians)
+def leg_lengths(lat, lng):
+    return great_circle_distances(lat[:-1], lng[:-1], lat[1:], lng[1:])
+
+# Offsets in meters (east, north) of points relative to the centers, in the local plane of each center
+def local_offsets(lat, lng, center_lat, center_lng):
+    return (lng - center_lng) * np.cos(center_lat) * EARTH_RADIUS, (lat - center_lat) * EARTH_RADIUS
+
+# Move the points of the given areas to the edge of their cylinder in the given direction (relative to the center)
+def place_on_cylinder(center_lat, center_lng, radius, east, north):
+    length = np.hypot(east, north)
+    # Both neighbours in exactly opposite directions: any direction is as good, use the perpendicular one
+    east, north = np.where(length > 0, east, 1.0), np.where(length > 0, north, 0.0)
+    length = np.where(length > 0, length, 1.0)
+    lat = center_lat + radius * north / length / EARTH_RADIUS
+    lng = center_lng + radius * east / length / (EARTH_RADIUS * np.cos(center_lat))
+    return lat, lng
+
+# Find the turn points inside the AAT areas that give the shortest route (start and finish stay on their points)
+# The route length is convex, so all turn points are moved together by accelerated projected gradient descent
+# (moving one area at a time gets stuck where turn points of overlapping areas meet)
+# Turn points are kept as offsets in meters from their area's point, the route itself in one plane around the task
+def shortest_aat_route(lat, lng, radius):
+    if len(lat) < 3:
+        return lat.copy(), lng.copy()
+    plane_cos = np.cos(np.mean(lat))
+    center_x, center_y = lng * plane_cos * EARTH_RADIUS, lat * EARTH_RADIUS
+    # Plane meters per local east meter of each area
+    scale = plane_cos / np.cos(lat)
+    areas = slice(1, len(lat) - 1)
+
+    # Keep the turn points inside their areas
+    def project(east, north):
+        length = np.hypot(east, north)
+        factor = np.where(length > radius, radius / np.maximum(length, 1e-9), 1.0)
+        factor[0] = factor[-1] = 0.0
+        return east * factor, north * factor
+
+    east, north = np.zeros(len(lat)), np.zeros(len(lat))
+    for smoothing in AAT_SMOOTHING_STEPS:
+        # The gradient of the smoothed length changes by at most 4 / smoothing per meter
+        step = smoothing / (4 * np.max(scale[areas] ** 2))
+        search_east, search_north, momentum = east.copy(), north.copy(), 1.0
+        for iteration in range(AAT_MAX_GRADIENT_ITERATIONS):
+            leg_x = np.diff(center_x + search_east * scale)
+            leg_y = np.diff(center_y + search_north)
+            length = np.sqrt(leg_x ** 2 + leg_y ** 2 + smoothing ** 2)
+            gradient_x, gradient_y = np.zeros(len(lat)), np.zeros(len(lat))
+            gradient_x[:-1] -= leg_x / length
+            gradient_x[1:] += leg_x / length
+            gradient_y[:-1] -= leg_y / length
+            gradient_y[1:] += leg_y / length
+            new_east, new_north = project(search_east - step * gradient_x * scale, search_north - step * gradient_y)
+
+            next_momentum = (1 + np.sqrt(1 + 4 * momentum ** 2)) / 2
+            movement = np.max(np.hypot(new_east - east, new_north - north))
+            search_east = new_east + (momentum - 1) / next_momentum * (new_east - east)
+            search_north = new_north + (momentum - 1) / next_momentum * (new_north - north)
+            east, north, momentum = new_east, new_north, next_momentum
+            if iteration > 10 and movement < 0.01 * smoothing:
+                break
+    return lat + north / EARTH_RADIUS, lng + east / (EARTH_RADIUS * np.cos(lat))
+
+# Longest route through points on the edge of each area (dynamic programming over AAT_EDGE_POINTS points per area)
+# The route length is convex in every turn point, so the longest route has all turn points on the edges of the areas
+def longest_route_on_edges(lat, lng, radius):
+    angles = np.linspace(0, 2 * np.pi, AAT_EDGE_POINTS, endpoint=False)
+    # Candidate turn points (one row per task point, start and finish only have their point)
+    edge_radius = radius.copy()
+    edge_radius[[0, -1]] = 0.0
+    candidate_lat = lat[:, None] + edge_radius[:, None] * np.cos(angles) / EARTH_RADIUS
+    candidate_lng = lng[:, None] + edge_radius[:, None] * np.sin(angles) / (EARTH_RADIUS * np.cos(lat[:, None]))
+
+    best = np.zeros(AAT_EDGE_POINTS)
+    previous = np.zeros((len(lat), AAT_EDGE_POINTS), dtype=int)
+    for idx in range(1, len(lat)):
+        # Length of the best route to each candidate of this point, through each candidate of the previous point
+        legs = great_circle_distances(candidate_lat[idx - 1][:, None], candidate_lng[idx - 1][:, None], candidate_lat[idx][None, :], candidate_lng[idx][None, :])
+        totals = best[:, None] + legs
+        previous[idx] = np.argmax(totals, axis=0)
+        best = totals[previous[idx], np.arange(AAT_EDGE_POINTS)]
+
+    route = np.zeros(len(lat), dtype=int)
+    route[-1] = np.argmax(best)
+    for idx in range(len(lat) - 1, 0, -1):
+        route[idx - 1] = previous[idx][route[idx]]
+    return candidate_lat[np.arange(len(lat)), route], candidate_lng[np.arange(len(lat)), route]
+
+# Find the turn points inside the AAT areas that give the longest route
+# Start and finish stay on their points, every area is a cylinder with radius oz_radius1 around its point
+# The best route through points on the edges is refined: odd and even areas are moved in turns, each one for the current points of its neighbours
+def longest_aat_route(lat, lng, radius):
+    if len(lat) < 3:
+        return lat.copy(), lng.copy()
+    route_lat, route_lng = longest_route_on_edges(lat, lng, radius)
+    for _ in range(AAT_MAX_ITERATIONS):
+        movement = 0.0
+        for first in (1, 2):
+            idx = np.arange(first, len(lat) - 1, 2)
+            if not len(idx):
+                continue
+            center_lat, center_lng = lat[idx], lng[idx]
+            # Neighbours and the current turn points in the local plane of each area
+            prev_east, prev_north = local_offsets(route_lat[idx - 1], route_lng[idx - 1], center_lat, center_lng)
+            next_east, next_north = local_offsets(route_lat[idx + 1], route_lng[idx + 1], center_lat, center_lng)
+            east, north = local_offsets(route_lat[idx], route_lng[idx], center_lat, center_lng)
+
+            # Unit vectors from the current turn point to both neighbours, their sum points to where the route gets shorter
+            to_prev = np.hypot(prev_east - east, prev_north - north)
+            to_next = np.hypot(next_east - east, next_north - north)
+            direction_east = (prev_east - east) / np.maximum(to_prev, 1e-9) + (next_east - east) / np.maximum(to_next, 1e-9)
+            direction_north = (prev_north - north) / np.maximum(to_prev, 1e-9) + (next_north - north) / np.maximum(to_next, 1e-9)
+            new_lat, new_lng = place_on_cylinder(center_lat, center_lng, radius[idx], -direction_east, -direction_north)
+
+            movement = max(movement, float(np.max(great_circle_distances(route_lat[idx], route_lng[idx], new_lat, new_lng))))
+            route_lat[idx], route_lng[idx] = new_lat, new_lng
+        if movement < AAT_TOLERANCE:
+            break
+    return route_lat, route_lng
+
+# Compute the geometry of a SoaringSpot task from its task_points (coordinates in radians, oz_radius1 in meters)
+# Returns the coordinates in degrees, the leg lengths and nominal distance through the points and, for AAT tasks,
+# the minimum and maximum achievable distance through the areas (all distances in meters)
+def task_geometry(task_points, aat=False):
+    lat, lng = radian_coordinates(task_points)
+    radius = np.array([point.get('oz_radius1', 0) for point in task_points], dtype=float)
+
+    legs = leg_lengths(lat, lng)
+    geometry = {
+        'latitudes': np.rad2deg(lat).tolist(),
+        'longitudes': np.rad2deg(lng).tolist(),
+        'legs': legs.tolist(),
+        'nominal': float(legs.sum()),
+        'min': None,
+        'max': None,
+    }
+    if aat:
+        geometry['min'] = float(leg_lengths(*shortest_aat_route(lat, lng, radius)).sum())
+        geometry['max'] = float(leg_lengths(*longest_aat_route(lat, lng, radius)).sum())
+    return geometry
+
+# Format the task distance for the output (in km)
+def format_task_distance(geometry):
+    text = f"{geometry['nominal'] / 1000:.1f} km"
+    if geometry['min'] is not None:
+        text += f" (AAT min {geometry['min'] / 1000:.1f} km, max {geometry['max'] / 1000:.1f} km)"
+    return text
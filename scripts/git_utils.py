@@ -0,0 +1,147 @@
+# Import necessary libraries
+from scripts import config
+import threading
+import queue
+import time
+import os
+
+# Publish requests waiting for the background worker (each entry is the time it was requested and the changed paths)
+publish_queue = queue.Queue()
+publish_worker_thread = None
+status_lock = threading.Lock()
+
+# Queue a commit/push of the given changed task and glider files, returns immediately
+def request_publish(paths):
+    if not paths and not config.publish_status['uncommitted'] and not config.publish_status['unpushed']:
+        print("ℹ️  No changes to commit.")
+        return
+    start_publish_worker()
+    with status_lock:
+        config.publish_status['pending'] += 1
+    publish_queue.put((time.time(), list(paths)))
+
+# Start the background publish worker (once)
+def start_publish_worker():
+    global publish_worker_thread
+    if publish_worker_thread is None or not publish_worker_thread.is_alive():
+        publish_worker_thread = threading.Thread(target=publish_worker, name="git-publish", daemon=True)
+        publish_worker_thread.start()
+
+# Take all queued requests, returns the time of the oldest one, the number of requests and all their paths
+def drain_publish_queue(first_request):
+    requests = [first_request]
+    while True:
+        try:
+            requests.append(publish_queue.get_nowait())
+        except queue.Empty:
+            break
+    paths = {path for _, request_paths in requests for path in request_paths}
+    return min(requested_at for requested_at, _ in requests), len(requests), sorted(paths)
+
+# Background worker: coalesces bursts of requests into one commit, commits and pushes with retries
+def publish_worker():
+    status = config.publish_status
+    while True:
+        first_request = publish_queue.get()
+        # Give the other updates of a burst a moment to arrive, then handle them all in one commit
+        time.sleep(config.publish_coalesce_delay)
+        requested_at, count, paths = drain_publish_queue(first_request)
+        with status_lock:
+            status['pending'] = max(status['pending'] - count, 0)
+            status['state'] = 'committing'
+        try:
+            from git import Repo
+            repo = Repo(os.getcwd())
+            # Files whose commit failed earlier are not written again (their content is unchanged), so they are added here
+            paths = sorted(set(paths) | status['uncommitted'])
+            try:
+                committed = commit_with_retries(repo, paths)
+            except Exception:
+                status['uncommitted'] |= set(paths)
+                raise
+            status['uncommitted'] = set()
+            if committed:
+                status['unpushed'] = True
+            if status['unpushed']:
+                push_with_retries(repo)
+            status['state'] = 'idle'
+            status['last_latency'] = time.time() - requested_at
+            status['last_publish'] = time.time()
+            status['last_error'] = None
+        except Exception as e:
+            status['state'] = 'failed'
+            status['last_error'] = str(e)
+            print(f"\n❌ Commit or push failed: {e}")
+
+# Stage and commit exactly the given files (no scan of the data/ tree), returns True if a commit was made
+def commit_task_and_glider_files(repo, paths):
+    if not paths:
+        return False
+    paths = [os.path.relpath(path, repo.working_tree_dir) for path in paths]
+    repo.git.add("--", *paths)
+    # Files rewritten with identical content leave nothing staged
+    if repo.git.diff("--cached", "--name-only", "--", *paths):
+        repo.index.commit("Update tasks and gliders")
+        return True
+    return False
+
+# Commit the given files, retrying with exponential backoff (e.g. while another git process holds the index lock)
+def commit_with_retries(repo, paths):
+    from git import GitCommandError
+    status = config.publish_status
+    for attempt in range(config.publish_max_retries + 1):
+        status['state'] = 'committing' if attempt == 0 else f'committing (retry {attempt})'
+        try:
+            return commit_task_and_glider_files(repo, paths)
+        except (GitCommandError, OSError):
+            if attempt == config.publish_max_retries:
+                raise
+            status['retries'] += 1
+            time.sleep(config.publish_retry_backoff * (2 ** attempt))
+
+# Push to origin, retrying with exponential backoff (commits of later requests are pushed along)
+def push_with_retries(repo):
+    from git import GitCommandError
+    status = config.publish_status
+    origin = repo.remote(name='origin')
+    for attempt in range(config.publish_max_retries + 1):
+        status['state'] = 'pushing' if attempt == 0 else f'pushing (retry {attempt})'
+        try:
+            origin.push()
+            status['unpushed'] = False
+            print(f"\n✅ Task and glider files committed and pushed.")
+            return
+        except GitCommandError:
+            if attempt == config.publish_max_retries:
+                raise
+            status['retries'] += 1
+            time.sleep(config.publish_retry_backoff * (2 ** attempt))
+
+# Wait until all queued publish requests are handled (e.g. before quitting), returns False on timeout
+def wait_for_publish(timeout):
+    end_time = time.time() + timeout
+    while config.publish_status['pending'] or config.publish_status['state'] not in ('idle', 'failed'):
+        if time.time() > end_time:
+            return False
+        time.sleep(0.2)
+    return True
+
+# Format the publish status for the menu
+def format_publish_status():
+    status = config.publish_status
+    if not config.commit_and_push_to_git:
+        return "disabled"
+    text = status['state']
+    if status['pending']:
+        text += f", {status['pending']} update(s) queued"
+    if status['uncommitted'] and status['state'] in ('idle', 'failed'):
+        text += f", {len(status['uncommitted'])} file(s) not committed yet"
+    if status['unpushed'] and status['state'] in ('idle', 'failed'):
+        text += ", local commits not pushed yet"
+    if status['last_latency'] is not None:
+        text += f", last publish took {status['last_latency']:.1f} s"
+    if status['retries']:
+        text += f", {status['retries']} commit/push retry(ies)"
+    if status['last_error']:
+        text += f" (last error: {status['last_error'].splitlines()[0]})"
+    return text
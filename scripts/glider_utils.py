@@ -1,17 +1,50 @@
 # Import necessary libraries
 from scripts import config
+from scripts import utils
+import hashlib
 import os
 import json
 import pandas as pd
-import csv
 
-# Create .txt files out of database.xlsx
-# Now creates .txt files out of Database.xlsx
-def create_glider_txt_file(class_name):
-    print(f"\t\t📄 Creating glider .txt file")
-    filename = config.filename_map.get(class_name, "all")
-    filepath = os.path.join(config.glider_output_dir, f"{filename}.txt")
-    
+# Build the glider records (FLARM ID, competition number and name, flag prefixed) with vectorized string operations
+def build_glider_records(df):
+    # Replace NaN with empty string for relevant columns
+    columns = df[['FlarmID', 'COMP', 'Flag', 'Name']].fillna('').astype(str)
+    # The flag (plus a space) is only prefixed when there is one
+    flag_prefix = (columns['Flag'] + ' ').where(columns['Flag'] != '', '')
+    return pd.DataFrame({
+        'flarm': columns['FlarmID'],
+        'cn': flag_prefix + columns['COMP'],
+        'name': flag_prefix + columns['Name'],
+    })
+
+# Build the glider list lines "FlarmID,,Flag COMP,Flag Name" of the .txt file
+def build_glider_lines(records):
+    return (records['flarm'] + ',,' + records['cn'] + ',' + records['name']).tolist()
+
+# Build the glider entries of the .json file
+def build_glider_json(records):
+    return [
+        {
+            "name": name,
+            "cn": cn,
+            "glider": "",
+            "comp": cn,
+            "flarm": [flarm],
+        }
+        for flarm, cn, name in zip(records['flarm'], records['cn'], records['name'])
+    ]
+
+# Load and validate Database.xlsx (the parsed sheet is cached on the file's modification time and size)
+def load_glider_database():
+    stat = os.stat(config.database_path)
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cache = config.glider_database_cache
+    if cache.get('key') == cache_key:
+        print(f"\tℹ️  Database unchanged, using cached '{config.database_path}'")
+        return cache['df']
+
+    print(f"\t🔍 Reading glider database '{config.database_path}'")
     df = pd.read_excel(config.database_path)
 
     # Ensure all needed columns exist
@@ -22,66 +55,79 @@ def create_glider_txt_file(class_name):
     # Drop rows where any required column is missing (i.e., end of table or incomplete rows)
     df = df.dropna(subset=['Name'])
 
-    if filename != 'all':
-        df = df[df['Class'].isin([class_name])]
+    cache['key'] = cache_key
+    cache['df'] = df
+    return df
+
+# Split the database into one frame per class
+def partition_glider_database(df):
+    class_frames = dict(tuple(df.groupby('Class', sort=False)))
+    return {class_name: class_frames.get(class_name, df.iloc[0:0]) for class_name in config.classes}
+
+# Load the glider manifest (hash of the records each glider file pair was last written from)
+def load_glider_manifest():
+    if not os.path.exists(config.glider_manifest_path):
+        return {}
+    try:
+        with open(config.glider_manifest_path, "r", encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"\t❌ Could not read glider manifest '{config.glider_manifest_path}', regenerating all glider files")
+        return {}
+
+# Hash the normalized glider records of a class
+def hash_glider_records(records):
+    return hashlib.sha256(json.dumps(records.values.tolist()).encode('utf-8')).hexdigest()
+
+# Create the .txt and .json glider files out of the (class) rows of Database.xlsx, returns the written paths
+def create_glider_files(class_name, df, records=None):
+    filename = config.filename_map.get(class_name, "all")
+    records = build_glider_records(df) if records is None else records
+
+    print(f"\t\t📄 Creating glider .txt file")
+    txt_filepath = os.path.join(config.glider_output_dir, f"{filename}.txt")
+    # Write all lines in one go (built manually to avoid any escaping)
+    lines = build_glider_lines(records)
+    utils.write_file_atomic(txt_filepath, "ID,CALL,CN,TYPE,NAME\n" + "".join(line + "\n" for line in lines))
+    print(f"\t\t✅ Saved .txt glider file at '{txt_filepath.replace(os.sep, '/')}'")
 
-    # Replace NaN with empty string for relevant columns
-    df[['FlarmID', 'COMP', 'Flag', 'Name']] = df[['FlarmID', 'COMP', 'Flag', 'Name']].fillna('')
-    
-    # Build the string using the specified format
-    df['String'] = df.apply(lambda row: f"{row['FlarmID']},,{row['Flag'] + ' ' if row['Flag'] else ''}{row['COMP']},{row['Flag'] + ' ' if row['Flag'] else ''}{row['Name']}", axis=1)
-
-    # Write lines manually to avoid any escaping
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write("ID,CALL,CN,TYPE,NAME\n")
-        for line in df['String']:
-            f.write(f"{line}\n")
-    
-    # Save only the "String" column to a .txt file
-    #df['String'].to_csv(filepath, index=False, header=False, quoting=csv.QUOTE_NONE, escapechar='\\')
-
-    print(f"\t\t✅ Saved .txt glider file at '{filepath.replace(os.sep, '/')}'")
-
-# Create a glider .json file from the .txt file
-def create_glider_json_file(class_name):
     print(f"\t\t📄 Creating glider .json file")
-    filename = os.path.join(config.glider_output_dir, f"{config.filename_map.get(class_name, 'all')}.txt")
-    outputfilename = filename.replace(".txt", ".json")
-    # read as csv with ID,CALL,CN,TYPE,NAME
-    lines = []
-    with open(filename, "r" ,encoding="utf-8") as f:
-        reader = csv.reader(f, delimiter="\t")
-        for row in reader:
-            lines.append(row[0].split(","))
-
-        with open(outputfilename, "w" ,encoding="utf-8") as f:
-            json.dump(
-                [
-                    {
-                        "name": line[4] if len(line) > 4 else "",
-                        "cn": line[2] if len(line) > 2 else "",
-                        "glider": "",
-                        "comp": line[2] if len(line) > 2 else "",
-                        "flarm": [line[0]] if len(line) > 0 else "",
-                    }
-                    for line in lines[1:]
-                ],
-                f,
-                indent=4,
-            )
-    print(f"\t\t✅ Saved .json glider file at '{outputfilename.replace(os.sep, '/')}'")
-
-# Create both .txt and .json files (only needed once below)
-def create_glider_files(class_name):
-    print(f"\t🔍 Fetching glider data")
-    create_glider_txt_file(class_name)
-    create_glider_json_file(class_name)
-
-# Update all glider files
-def update_glider_files():
+    json_filepath = os.path.join(config.glider_output_dir, f"{filename}.json")
+    utils.write_file_atomic(json_filepath, json.dumps(build_glider_json(records), indent=4))
+    print(f"\t\t✅ Saved .json glider file at '{json_filepath.replace(os.sep, '/')}'")
+    return [txt_filepath, json_filepath]
+
+# Update all glider files (the database is read once and split by class in memory)
+# In incremental mode only classes whose records changed since the last update are written
+# Returns the paths of all files that were written
+def update_glider_files(incremental=True):
     print("⚙️  Updating glider files...")
-    for class_name in config.classes:
-        print(f"\t⚙️  Updating glider files for class: {class_name}")
-        create_glider_files(class_name)
-    print(f"\t⚙️  Updating glider files for all classes combined")
-    create_glider_files('all')
\ No newline at end of file
+    df = load_glider_database()
+    class_frames = partition_glider_database(df)
+    class_frames['all'] = df
+    manifest = load_glider_manifest() if incremental else {}
+
+    skipped_classes = []
+    written_paths = []
+    for class_name, class_df in class_frames.items():
+        if class_name == 'all':
+            print(f"\t⚙️  Updating glider files for all classes combined")
+        else:
+            print(f"\t⚙️  Updating glider files for class: {class_name}")
+        records = build_glider_records(class_df)
+        records_hash = hash_glider_records(records)
+        filename = config.filename_map.get(class_name, "all")
+        files_exist = all(os.path.exists(os.path.join(config.glider_output_dir, f"{filename}.{ext}")) for ext in ('txt', 'json'))
+        if manifest.get(class_name) == records_hash and files_exist:
+            print(f"\t\tℹ️  Gliders unchanged, keeping existing .txt/.json files")
+            skipped_classes.append(class_name)
+            continue
+        written_paths += create_glider_files(class_name, class_df, records)
+        manifest[class_name] = records_hash
+
+    if written_paths:
+        utils.write_file_atomic(config.glider_manifest_path, json.dumps(manifest, indent=4, sort_keys=True))
+        written_paths.append(config.glider_manifest_path)
+    if skipped_classes:
+        print(f"\tℹ️  Skipped unchanged glider files for: {', '.join(skipped_classes)}")
+    return written_paths
@@ -0,0 +1,60 @@
+# Import necessary libraries
+from scripts import config
+from requests.adapters import HTTPAdapter
+import threading
+import requests
+import random
+import time
+
+# Lock guarding the shared session counters (requests may be issued from several threads)
+stats_lock = threading.Lock()
+
+# Return the shared HTTP session, creating it on first use
+def get_session():
+    if config.http_session is None:
+        session = requests.Session()
+        # Keep-alive pool: one pool per host, at most http_pool_maxsize connections per host
+        adapter = HTTPAdapter(pool_connections=config.http_pool_hosts, pool_maxsize=config.http_pool_maxsize, pool_block=True, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        config.http_session = session
+    return config.http_session
+
+# Count the connections the session has opened so far (each one is a TCP/TLS handshake)
+def count_connections(session, url):
+    pools = session.get_adapter(url).poolmanager.pools
+    total = 0
+    for key in pools.keys():
+        try:
+            total += pools[key].num_connections
+        except KeyError:
+            continue
+    return total
+
+# GET a URL through the shared session with a timeout and jittered exponential backoff on 5xx and connection errors
+def get(url, headers=None, timeout=None):
+    session = get_session()
+    timeout = timeout or config.http_timeout
+    max_retries = config.http_max_retries
+    for attempt in range(max_retries + 1):
+        connections_before = count_connections(session, url)
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+        else:
+            with stats_lock:
+                config.http_stats['requests'] += 1
+                if count_connections(session, url) == connections_before:
+                    config.http_stats['handshakes_avoided'] += 1
+            if response.status_code < 500 or attempt == max_retries:
+                return response
+        with stats_lock:
+            config.http_stats['retries'] += 1
+        time.sleep(config.http_backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+# Format the shared session counters for output
+def format_http_stats():
+    stats = config.http_stats
+    return f"{stats['requests']} request(s), {stats['handshakes_avoided']} handshake(s) avoided, {stats['retries']} retry(ies)"
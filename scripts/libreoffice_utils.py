@@ -1,9 +1,16 @@
 # Import necessary libraries
 from scripts import config
 import subprocess
+import threading
+import pathlib
+import atexit
 import psutil
+import time
 import os
 
+# Lock around starting the conversion listener (started in the background and by conversions, only one may be launched)
+listener_lock = threading.Lock()
+
 # Function to open a file in LibreOffice Impress
 def open_file(filepath):
     try:
@@ -11,36 +18,153 @@ def open_file(filepath):
     except Exception as e:
         print(f"❌ Could not open file in LibreOffice: {e}")
 
-# Function to close all LibreOffice windows
-def close_windows():
+# Process IDs of the conversion listener (soffice starts the actual office as a child process)
+def listener_pids():
+    listener = config.libreoffice_listener
+    if listener is None or listener.poll() is not None:
+        return set()
+    try:
+        return {listener.pid} | {child.pid for child in psutil.Process(listener.pid).children(recursive=True)}
+    except psutil.NoSuchProcess:
+        return set()
+
+# Function to close all LibreOffice windows (the conversion listener is kept running unless stop_listener is set)
+def close_windows(stop_listener=False):
     print("⚠️  Closing all LibreOffice windows...")
+    keep = set() if stop_listener else listener_pids()
     closed = 0
     for proc in psutil.process_iter(['name']):
         try:
-            if proc.info['name'] and 'soffice' in proc.info['name'].lower():
+            if proc.info['name'] and 'soffice' in proc.info['name'].lower() and proc.pid not in keep:
                 proc.terminate()
                 closed += 1
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
+    if stop_listener:
+        config.libreoffice_listener = None
+        config.libreoffice_desktop = None
     if closed:
         print(f"✅ Closed {closed} LibreOffice process(es).")
     else:
         print("ℹ️  No LibreOffice processes found.")
 
-# Function to convert ODP files to PDF using LibreOffice
+# Stop the conversion listener (e.g. when quitting)
+def stop_conversion_listener():
+    for pid in listener_pids():
+        try:
+            psutil.Process(pid).terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    config.libreoffice_listener = None
+    config.libreoffice_desktop = None
+
+# The headless listener has no window to close, so it is also stopped when the script exits without the quit menu
+atexit.register(stop_conversion_listener)
+
+# Check if the "uno" module (LibreOffice's Python bridge) can be used for the conversion listener
+def uno_available():
+    try:
+        import uno
+        return True
+    except ImportError:
+        return False
+
+# Start the headless LibreOffice listening on the UNO socket (once), returns False if the warm conversion cannot be used
+def start_conversion_listener():
+    if not config.libreoffice_warm_conversion or not uno_available():
+        return False
+    with listener_lock:
+        return launch_conversion_listener()
+
+# Launch the listener process if it is not running (called with listener_lock held)
+def launch_conversion_listener():
+    if config.libreoffice_listener is not None and config.libreoffice_listener.poll() is None:
+        return True
+    profile_dir = os.path.abspath(config.libreoffice_user_data_dir)
+    os.makedirs(profile_dir, exist_ok=True)
+    try:
+        config.libreoffice_listener = subprocess.Popen([
+            config.soffice_path, "--headless", "--invisible", "--norestore", "--nologo", "--nodefault",
+            f"--accept=socket,host=127.0.0.1,port={config.libreoffice_listener_port};urp;StarOffice.ComponentContext",
+            f"-env:UserInstallation={pathlib.Path(profile_dir).as_uri()}",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        config.libreoffice_desktop = None
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not start the LibreOffice conversion listener: {e}")
+        return False
+
+# Start the conversion listener without waiting for it, so a later PDF conversion is already warm
+def start_conversion_listener_in_background():
+    threading.Thread(target=start_conversion_listener, name="libreoffice-listener", daemon=True).start()
+
+# Connect to the conversion listener, waiting until it accepts connections, returns its desktop
+def connect_to_listener():
+    import uno
+    from com.sun.star.connection import NoConnectException
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_context)
+    end_time = time.time() + config.libreoffice_listener_timeout
+    while True:
+        try:
+            context = resolver.resolve(f"uno:socket,host=127.0.0.1,port={config.libreoffice_listener_port};urp;StarOffice.ComponentContext")
+            return context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+        except NoConnectException:
+            if time.time() > end_time or config.libreoffice_listener.poll() is not None:
+                raise
+            time.sleep(0.2)
+
+# Create a UNO property
+def uno_property(name, value):
+    from com.sun.star.beans import PropertyValue
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+# Convert a file to PDF in the running listener
+def convert_with_listener(odp_path, pdf_path):
+    import uno
+    if config.libreoffice_desktop is None:
+        config.libreoffice_desktop = connect_to_listener()
+    document = config.libreoffice_desktop.loadComponentFromURL(uno.systemPathToFileUrl(os.path.abspath(odp_path)), "_blank", 0, (uno_property("Hidden", True),))
+    if document is None:
+        raise RuntimeError(f"LibreOffice could not load {odp_path}")
+    try:
+        document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf_path)), (uno_property("FilterName", "impress_pdf_Export"),))
+    finally:
+        document.close(True)
+
+# Convert a file to PDF with a new LibreOffice process (cold start every time)
+def convert_with_subprocess(odp_path, output_dir):
+    subprocess.run([
+        config.soffice_path, "--headless", "--convert-to", "pdf", odp_path, "--outdir", output_dir
+    ], check=True)
+
+# Function to convert ODP files to PDF using LibreOffice (warm listener if available, one-shot soffice otherwise)
 def convert_odp_to_pdf(odp_path):
     output_dir = os.path.dirname(odp_path)
+    pdf_path = odp_path.replace('.odp', '.pdf')
+    start = time.perf_counter()
     try:
-        subprocess.run([
-            config.soffice_path, "--headless", "--convert-to", "pdf", odp_path, "--outdir", output_dir
-        ], check=True)
-        pdf_path = odp_path.replace('.odp', '.pdf')
+        mode = "one-shot"
+        if start_conversion_listener():
+            try:
+                convert_with_listener(odp_path, pdf_path)
+                mode = "warm listener"
+            except Exception as e:
+                # The listener may have been closed or crashed, reconnect on the next conversion
+                config.libreoffice_desktop = None
+                print(f"⚠️  LibreOffice conversion listener not available, converting with a new LibreOffice process: {e}")
+                convert_with_subprocess(odp_path, output_dir)
+        else:
+            convert_with_subprocess(odp_path, output_dir)
         if os.path.exists(pdf_path):
-            print(f"✅ PDF created at {pdf_path}")
+            print(f"✅ PDF created at {pdf_path} ({mode}, {time.perf_counter() - start:.1f} s)")
             return pdf_path
         else:
             print("❌ PDF conversion failed.")
             return None
     except Exception as e:
         print(f"❌ PDF conversion error: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -1,10 +1,11 @@
 # Import necessary libraries
+# (task_utils, glider_utils, browser_utils and whatsapp_utils pull in requests, bs4, numpy, pandas and selenium,
+# so they are imported by the actions that need them, keeping the startup fast)
 from scripts import libreoffice_utils
-from scripts import whatsapp_utils
 from scripts import weather_utils
-from scripts import browser_utils
-from scripts import glider_utils
-from scripts import task_utils
+from scripts import schedule_utils
+from scripts import git_utils
+from scripts import url_utils
 from scripts import config
 from scripts import utils
 import time
@@ -60,87 +61,160 @@ def print_menu_header():
     print("5. Open tabs from the URL file")
     print("6. Open the latest weather briefing")
     print("7. Send latest weather briefing via WhatsApp")
-    print("8. Close all open tabs and LibreOffice windows")
+    if config.keep_browser_sessions_warm:
+        print("8. Close all open tabs and LibreOffice windows (browser windows are minimised and kept for reuse)")
+    else:
+        print("8. Close all open tabs and LibreOffice windows")
     print('9. Load previous task for classes')
     print("0. Update git settings (enable/disable automatic commit and push after updates)")
+    print(f"   Task IDs: {utils.format_task_id_status()}")
+    print(f"   Git publish status: {git_utils.format_publish_status()}")
     print("Q. Quit")
     print("="*100)
 
 # Do a full day preparation
 def day_preparation():
-    # --- TASK AND GLIDER FILES ---
+    from scripts import browser_utils
     print("⚙️  Preparing for the day...")
-    # Update task files
-    update_task_and_glider_files()
-    # Update weather briefing
-    weather_utils.update_metbrief()
-    # Open browser tabs from the URL file and latest weather briefing
-    open_tabs()
-    # Open the latest weather briefing
-    open_metbrief()
+    # Tabs with placeholders show the task IDs and the task and glider files on GitHub, so they wait for the push
+    # (the browsers are started in the meantime), all other stages run at the same time
+    tabs_wait_for_push = os.path.exists(config.url_file) and url_utils.url_file_uses_placeholders(config.url_file)
+    stages = [
+        ("task and glider files", update_task_and_glider_files, []),
+        ("git push", wait_for_pushed_files, ["task and glider files"]),
+        ("weather briefing", weather_utils.update_metbrief, []),
+        ("open weather briefing", open_metbrief, ["weather briefing"]),
+    ]
+    if tabs_wait_for_push:
+        stages += [
+            ("browser start", browser_utils.prelaunch_tab_browsers, []),
+            ("tabs", open_tabs, ["browser start", "git push"]),
+        ]
+    else:
+        stages.append(("tabs", open_tabs, []))
+    timeline = schedule_utils.run_stages(stages)
+    schedule_utils.print_timeline(timeline, "Day preparation timeline")
+
+# Wait until the updated task and glider files are pushed (if publishing is enabled)
+def wait_for_pushed_files():
+    if not config.commit_and_push_to_git:
+        return
+    if config.publish_status['pending'] or config.publish_status['state'] not in ('idle', 'failed'):
+        print("⏳ Waiting for the task and glider files to be pushed before opening the tabs...")
+        if not git_utils.wait_for_publish(timeout=config.day_preparation_publish_timeout):
+            print("⚠️  Task and glider files not pushed yet, opening the tabs anyway.")
 
 def menu_continuous_mode():
-    # Find newest tasks
-    config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
+    from scripts import task_utils
+    import requests
+    try:
+        # Find newest tasks
+        config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
 
-    # Update task files
-    task_utils.update_task_files()
+        # Update task files
+        written_paths = task_utils.update_task_files()
 
-    # Commit and push task and glider files if enabled
-    if config.commit_and_push_to_git == True:
-        utils.commit_and_push_task_and_glider_files()
+        # Commit and push task and glider files if enabled
+        if config.commit_and_push_to_git == True:
+            git_utils.request_publish(written_paths)
+    except requests.RequestException as e:
+        # SoaringSpot not reachable: the loop picks the tasks up as new tasks once it is back
+        print(f"❌ Could not update the task files ({e}). Retrying in the continuous update loop.")
 
     print("🔄 Entering continuous update mode. Press Ctrl+C to stop. \n")
     
     try:
         while True:
-            # Check for new tasks every 30 seconds
-            current_task_ids = task_utils.return_latest_task_ids_for_classes()
-            if current_task_ids != config.selected_task_ids:
-                print("🆕 New tasks detected! Updating and pushing...")
-                # Update task files with latest version
-                update_task_and_glider_files()
-            else:
-                print("⏳ No new tasks. Checking again in 30 seconds... Press Ctrl+C to stop.")
+            # Check for new tasks every 30 seconds (unchanged results pages are not parsed again)
+            try:
+                class_task_ids, poll_stats = task_utils.poll_class_task_ids()
+            except Exception as e:
+                print(f"❌ Could not check for new tasks ({e}). Retrying in 30 seconds... Press Ctrl+C to stop.")
+                time.sleep(30)
+                continue
+            current_task_ids = task_utils.latest_task_ids(class_task_ids)
+            try:
+                if current_task_ids != config.selected_task_ids:
+                    print("🆕 New tasks detected! Updating and pushing...")
+                    # Update task files with latest version
+                    update_task_and_glider_files()
+                else:
+                    # Same task IDs, but organisers may have edited a task in place
+                    republished_classes, retry_classes = task_utils.detect_republished_classes()
+                    if republished_classes:
+                        print(f"🆕 Task changed for {', '.join(republished_classes)}! Updating and pushing...")
+                    if retry_classes:
+                        print(f"🔁 Task files incomplete for {', '.join(retry_classes)}, retrying...")
+                    if republished_classes or retry_classes:
+                        # Only these classes need new task files, gliders are unaffected
+                        written_paths = task_utils.update_task_files(republished_classes + retry_classes)
+                        if config.commit_and_push_to_git == True:
+                            git_utils.request_publish(written_paths)
+                    else:
+                        print(f"⏳ No new tasks ({task_utils.format_poll_stats(poll_stats)}). Checking again in 30 seconds... Press Ctrl+C to stop.")
+            except requests.RequestException as e:
+                print(f"❌ Could not update the task files ({e}). Retrying in 30 seconds... Press Ctrl+C to stop.")
             time.sleep(30)
     except KeyboardInterrupt:
         print("\n⏹️  Continuous update stopped by user.")
 
 # Select task IDs for each class
 def select_task_ids():
-    task_utils.select_task_ids()
+    from scripts import task_utils
+    import requests
+    try:
+        task_utils.select_task_ids()
 
-    # Update task files
-    task_utils.update_task_files()
+        # Update task files
+        written_paths = task_utils.update_task_files()
 
-    # Commit and push task and glider files if enabled
-    if config.commit_and_push_to_git == True:
-        utils.commit_and_push_task_and_glider_files()
+        # Commit and push task and glider files if enabled
+        if config.commit_and_push_to_git == True:
+            git_utils.request_publish(written_paths)
 
-    # Go back to original tasks
-    config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
+        # Go back to original tasks
+        config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
+    except requests.RequestException as e:
+        print(f"❌ Could not load the previous tasks ({e}). Please try again.")
 
 # Function to update task and glider files
 def update_task_and_glider_files():
-    # Find newest tasks
-    config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
+    from scripts import glider_utils
+    from scripts import task_utils
+    import requests
+    try:
+        # Find newest tasks
+        config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
 
-    # Update task files
-    task_utils.update_task_files()
-    # Update glider files
-    glider_utils.update_glider_files()
+        # Update task files
+        written_paths = task_utils.update_task_files()
+        # Update glider files
+        written_paths += glider_utils.update_glider_files()
+    except requests.RequestException as e:
+        print(f"❌ Could not update the task and glider files ({e}). Please try again.")
+        return
     # Commit and push task and glider files if enabled
     if config.commit_and_push_to_git == True:
-        utils.commit_and_push_task_and_glider_files()
+        git_utils.request_publish(written_paths)
 
 # Function to close all browser windows
 def open_tabs():
+    from scripts import browser_utils
+    # The tabs are filled in with the task IDs, which may still be loading in the background
+    utils.wait_for_task_ids()
+    # Without task IDs the URLs with class placeholders would be left out, so look them up again
+    if not config.selected_task_ids and os.path.exists(config.url_file) and url_utils.url_file_uses_class_placeholders(config.url_file):
+        print("⚙️  Task IDs are not loaded, looking them up again...")
+        error = utils.reload_task_ids()
+        if error:
+            print(f"⚠️  Could not load the task IDs ({error}), the URLs with task placeholders are not opened.")
     browser_utils.open_tabs()
 
-# Function to close all browser and LibreOffice windows
-def close_windows():
-    browser_utils.close_windows()
-    libreoffice_utils.close_windows()
+# Function to close all browser and LibreOffice windows (quit_sessions also ends the warm browser sessions)
+def close_windows(quit_sessions=False):
+    from scripts import browser_utils
+    browser_utils.close_windows(quit_sessions)
+    libreoffice_utils.close_windows(stop_listener=quit_sessions)
 
 def open_metbrief():
     # Open the latest weather briefing
@@ -150,6 +224,8 @@ def open_metbrief():
     if os.path.exists(filepath):
         libreoffice_utils.open_file(fullFilepath)
         print(f"✅ Latest weather briefing opened")
+        # The briefing is usually sent next, so get the LibreOffice conversion listener ready in the meantime
+        libreoffice_utils.start_conversion_listener_in_background()
     else:
         print("❌ Latest weather briefing not found. Please generate it first.")
 
@@ -162,7 +238,7 @@ def update_open_metbrief():
     # Open the latest weather briefing
     open_metbrief()
 
-# Function to send the weather briefing to a WhatsApp group
+# Function to send the weather briefing to the WhatsApp groups
 def send_whatsapp():
     print(f"⚙️  Creating PDF from ODP file...")
     odp_path = weather_utils.get_latest_weather_briefing_fullPath()
@@ -171,6 +247,7 @@ def send_whatsapp():
         return
     pdf_path = libreoffice_utils.convert_odp_to_pdf(odp_path)
     if pdf_path:
+        from scripts import whatsapp_utils
         whatsapp_utils.send_pdf_to_whatsapp_group(pdf_path)
 
 # Function to enable/disable git commit/push elsewhere
@@ -197,11 +274,23 @@ def menu_quit():
 
         # Close all browser and LibreOffice windows if the user chooses to do so
         if choice == "y":
-            close_windows()
+            close_windows(quit_sessions=True)
         elif choice == "n":
-            print("ℹ️  Not closing any windows.")
+            print("ℹ️  Not closing any open windows.")
         else:
-            print("ℹ️  Invalid choice. Not closing any windows.")
+            print("ℹ️  Invalid choice. Not closing any open windows.")
+        # Minimised warm browser sessions and the headless conversion listener have no open window, so they are always stopped
+        # (both are also stopped on any other exit)
+        if config.parked_window_rects:
+            from scripts import browser_utils
+            browser_utils.quit_parked_drivers()
+        libreoffice_utils.stop_conversion_listener()
+
+        # Let queued commits/pushes finish before the worker thread is stopped
+        if config.publish_status['pending'] or config.publish_status['state'] not in ('idle', 'failed'):
+            print("⏳ Waiting for pending git commit/push to finish...")
+            if not git_utils.wait_for_publish(timeout=60):
+                print("❌ Git commit/push did not finish in time. Please push the files manually.")
 
         print("\n👋 Exiting the script. Thank you for using the Team Captain Script!")
     except KeyboardInterrupt:
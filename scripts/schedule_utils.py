@@ -0,0 +1,53 @@
+# Import necessary libraries
+from scripts import utils
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+
+# Run one stage with its output buffered, returns (output, start, end, error) with times relative to the start of the schedule
+def run_stage(func, schedule_start):
+    start = time.perf_counter() - schedule_start
+    output, _, error = utils.run_with_buffered_output(func)
+    return output, start, time.perf_counter() - schedule_start, error
+
+# Run stages as a dependency graph: every stage starts as soon as all stages it depends on have finished
+# stages is a list of (name, function, [names of the stages it depends on]), returns {name: (start, end, error)}
+# A failed stage does not stop the stages depending on it; the output of each stage is printed when it finishes
+def run_stages(stages):
+    names = {name for name, _, _ in stages}
+    for name, _, dependencies in stages:
+        unknown = [dependency for dependency in dependencies if dependency not in names]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s) {unknown}")
+
+    schedule_start = time.perf_counter()
+    timeline = {}
+    pending = list(stages)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(len(stages), 1)) as executor:
+        while pending or running:
+            for stage in [stage for stage in pending if all(dependency in timeline for dependency in stage[2])]:
+                pending.remove(stage)
+                name, func, _ = stage
+                running[executor.submit(run_stage, func, schedule_start)] = name
+            if not running:
+                raise ValueError(f"Circular dependency between the stages {[name for name, _, _ in pending]}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                output, start, end, error = future.result()
+                print(output, end="")
+                if error:
+                    print(f"❌ Stage '{name}' failed: {error}")
+                timeline[name] = (start, end, error)
+    return timeline
+
+# Print when each stage ran, as a bar chart over the total duration
+def print_timeline(timeline, title, width=40):
+    total = max((end for _, end, _ in timeline.values()), default=0) or 1
+    name_width = max((len(name) for name in timeline), default=0)
+    print(f"⏱️  {title} ({total:.1f} s):")
+    for name, (start, end, error) in sorted(timeline.items(), key=lambda item: item[1][0]):
+        offset = int(round(start / total * width))
+        length = max(int(round(end / total * width)) - offset, 1)
+        bar = (" " * offset + "█" * length).ljust(width)
+        print(f"\t{'❌' if error else '✅'} {name.ljust(name_width)} |{bar}| {start:5.1f} s → {end:5.1f} s ({end - start:.1f} s)")
@@ -1,25 +1,31 @@
 # Import necessary libraries
+from scripts import geometry_utils
+from scripts import http_utils
 from scripts import config
-from xml.etree.ElementTree import Element, SubElement, ElementTree, tostring
+from scripts import utils
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
 from bs4 import BeautifulSoup
-from xml.dom import minidom
-import numpy as np
 import requests
+import datetime
+import hashlib
 import json
 import html
 import os
+import time
 import re
 
-# Get all available task IDs for a given class
-def get_class_task_ids(class_name):
-    url_comp_results = f'{config.base_url}/results'
-    soup = BeautifulSoup(requests.get(url_comp_results).text, "html.parser")
+# Extract the sorted task IDs for every class from the SoaringSpot results page
+def parse_class_task_ids(results_html):
+    soup = BeautifulSoup(results_html, "html.parser")
     result_class_all = soup.find_all('table', class_='result-overview')
-    task_ids = []
+    class_task_ids = {class_name: [] for class_name in config.classes}
     pattern = re.compile(r'(daily|practice|task)-\d+-on-\d{4}-\d{2}-\d{2}')
     for comp_class in result_class_all:
-        classURL = config.results_table_map.get(class_name, False)
-        if classURL not in str(comp_class.contents[1]):
+        table_header = str(comp_class.contents[1])
+        # A results table may match more than one class name, so check every class
+        matching_classes = [class_name for class_name in config.classes if config.results_table_map.get(class_name, False) in table_header]
+        if not matching_classes:
             continue
         for element in comp_class.find_all('tr'):
             for url in element.find_all('a'):
@@ -27,20 +33,77 @@ def get_class_task_ids(class_name):
                 match = pattern.search(href)
                 if match:
                     task_id = match.group(0)
-                    if task_id not in task_ids:
-                        task_ids.append(task_id)
+                    for class_name in matching_classes:
+                        if task_id not in class_task_ids[class_name]:
+                            class_task_ids[class_name].append(task_id)
 
     # Sort by date (assuming format ...on-YYYY-MM-DD)
-    task_ids_sorted = sorted(task_ids, key=lambda x: x.split('-on-')[-1])
-    latest = task_ids_sorted[-1] if task_ids_sorted else None
-    return task_ids_sorted, latest
+    for class_name, task_ids in class_task_ids.items():
+        class_task_ids[class_name] = sorted(task_ids, key=lambda x: x.split('-on-')[-1])
+    return class_task_ids
+
+# Poll the results page with a conditional request and only re-parse it if its content changed
+def poll_class_task_ids():
+    url_comp_results = f'{config.base_url}/results'
+    state = config.results_poll_state
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+    response = http_utils.get(url_comp_results, headers=headers)
+    poll_stats = {'status': response.status_code, 'changed': False, 'bytes_saved': 0, 'parse_time_saved': 0.0}
+
+    cached_task_ids = state.get('class_task_ids')
+    if cached_task_ids is not None and response.status_code == 304:
+        # Nothing was downloaded and nothing needs parsing
+        poll_stats['bytes_saved'] = state['body_size']
+        poll_stats['parse_time_saved'] = state['parse_time']
+    elif cached_task_ids is not None and response.status_code != 200:
+        print(f"\t❌ Failed to fetch {url_comp_results} (HTTP {response.status_code}), keeping previous task IDs")
+    else:
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if cached_task_ids is not None and body_hash == state.get('body_hash'):
+            # Same page as last time (server ignored the conditional headers)
+            poll_stats['parse_time_saved'] = state['parse_time']
+        else:
+            start = time.perf_counter()
+            state['class_task_ids'] = parse_class_task_ids(response.text)
+            state['parse_time'] = time.perf_counter() - start
+            state['body_hash'] = body_hash
+            state['body_size'] = len(response.content)
+            poll_stats['changed'] = True
+        if response.status_code == 200:
+            state['etag'] = response.headers.get('ETag')
+            state['last_modified'] = response.headers.get('Last-Modified')
+
+    state['bytes_saved_total'] = state.get('bytes_saved_total', 0) + poll_stats['bytes_saved']
+    state['parse_time_saved_total'] = state.get('parse_time_saved_total', 0.0) + poll_stats['parse_time_saved']
+    return {class_name: list(task_ids) for class_name, task_ids in state['class_task_ids'].items()}, poll_stats
+
+# Get all available task IDs for all classes (one request to the results page per call)
+def get_all_class_task_ids():
+    class_task_ids, _ = poll_class_task_ids()
+    return class_task_ids
+
+# Pick the latest task ID for each class
+def latest_task_ids(class_task_ids):
+    return {class_name: task_ids[-1] if task_ids else None for class_name, task_ids in class_task_ids.items()}
+
+# Format the savings of a results page poll for the continuous mode output
+def format_poll_stats(poll_stats):
+    state = config.results_poll_state
+    return (f"HTTP {poll_stats['status']}, saved {poll_stats['bytes_saved'] / 1024:.1f} kB and {poll_stats['parse_time_saved'] * 1000:.0f} ms parsing"
+            f" (session: {state.get('bytes_saved_total', 0) / 1024:.1f} kB, {state.get('parse_time_saved_total', 0.0):.1f} s)")
 
 # Select task IDs for each class
 def select_task_ids():
     print("\n⚙️  Selecting task IDs for each class...")
     config.selected_task_ids = {}
+    class_task_ids = get_all_class_task_ids()
     for class_name in config.classes:
-        all_task_ids, latest_task_id = get_class_task_ids(class_name)
+        all_task_ids = class_task_ids[class_name]
+        latest_task_id = all_task_ids[-1] if all_task_ids else None
         print(f"\n📋 Available task IDs for {class_name}:")
         for idx, tid in enumerate(all_task_ids):
             print(f"\t{idx+1}: {tid}")
@@ -53,11 +116,7 @@ def select_task_ids():
 
 # Function to return the latest task IDs for each class
 def return_latest_task_ids_for_classes():
-    latest_task_ids = {}
-    for class_name in config.classes:
-        _, latest_task_id = get_class_task_ids(class_name)
-        latest_task_ids[class_name] = latest_task_id
-    return latest_task_ids
+    return latest_task_ids(get_all_class_task_ids())
 
 # Fetch task data for a given class from SoaringSpot
 def fetch_task_data(class_name):
@@ -69,89 +128,128 @@ def fetch_task_data(class_name):
         return None
     
     url = f"{config.base_url}/tasks/{classURL}/{task_id}"
-    
-    response = requests.get(url)
+
+    # The change check of the continuous mode may just have downloaded this page
+    cached_page = config.task_page_cache.pop(class_name, None)
+    if cached_page and cached_page[0] == task_id:
+        print(f"\t\t♻️  Reusing the task page downloaded by the change check")
+        return cached_page[1]
+
+    try:
+        response = http_utils.get(url)
+    except requests.RequestException as e:
+        print(f"\t❌ Failed to fetch {url} ({e})")
+        return None
     if response.status_code != 200:
         print(f"\t❌ Failed to fetch {url} (HTTP {response.status_code})")
         return None
     else:
         return response
 
+# Marker in front of the taskData payload on a SoaringSpot task page
+TASK_DATA_MARKER = b'taskNormalize('
+json_decoder = json.JSONDecoder()
+
 # Extract JSON data from the HTML response for a given class
 def extract_json_from_html(html_response):
-    print(f"\t\t📄 Creating .json file")
-
-    # Parse the HTML response to find the task data
-    soup = BeautifulSoup(html_response.content, 'html.parser')
-    script_tag = soup.find('script', string=re.compile(r'var taskData'))
-    if not script_tag:
+    # Only the script text behind the marker is decoded, the rest of the page is never parsed
+    content = html_response.content
+    marker_idx = content.find(TASK_DATA_MARKER)
+    if marker_idx == -1:
         print(f"\t❌ taskData not found")
         return None
+    start = marker_idx + len(TASK_DATA_MARKER)
+    end = content.find(b'</script>', start)
+    script_tail = content[start:end if end != -1 else len(content)].decode('utf-8', errors='replace')
+    json_start = len(script_tail) - len(script_tail.lstrip())
 
-    # Extract the JSON data from the script tag
-    script_content = script_tag.string
-    match = re.search(r'var taskData = Map\.SoaringSpot\.taskNormalize\((\{.*?\})\);', script_content, re.DOTALL)
-    if not match:
+    # raw_decode stops exactly at the end of the first object, whatever its strings contain
+    try:
+        json_data, json_end = json_decoder.raw_decode(script_tail, json_start)
+    except json.JSONDecodeError:
+        # Entity-encoded payload (&quot; etc.), decode it after unescaping
+        try:
+            unescaped_tail = html.unescape(script_tail)
+            json_data, _ = json_decoder.raw_decode(unescaped_tail, len(unescaped_tail) - len(unescaped_tail.lstrip()))
+        except json.JSONDecodeError as e:
+            print(f"\t❌ JSON parsing error: {e}")
+            return None
+        if not isinstance(json_data, dict):
+            print(f"\t❌ taskData JSON not found in script")
+            return None
+        return json_data
+    if not isinstance(json_data, dict):
         print(f"\t❌ taskData JSON not found in script")
         return None
 
-    # Extract the JSON string and clean it up
-    raw_str = match.group(1).strip()
-    end_idx = raw_str.find(', [{')  # Find where first object ends
-    if end_idx != -1:
-        raw_str = raw_str[:end_idx]  # Keep only the first JSON object    
-    json_str = html.unescape(raw_str)
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        print(f"\t❌ JSON parsing error: {e}")
-        return None
+    # HTML entities inside strings (e.g. &amp; in turnpoint names) are unescaped like before
+    raw_str = script_tail[json_start:json_end]
+    if '&' in raw_str:
+        try:
+            return json.loads(html.unescape(raw_str))
+        except json.JSONDecodeError:
+            pass
+    return json_data
+
+# Escape an XML attribute value (same escaping as the previous minidom pretty-printer)
+def escape_tsk_attribute(value):
+    return escape(str(value), {'"': '&quot;'})
 
-# Create a waypoint element in the XML structure for the .tsk file
-def create_waypoint(parent, point):
+# Write an XML element with the .tsk indentation (2 spaces per level), either empty ("<tag .../>") or as a start tag
+def write_tsk_element(f, depth, tag, attributes, empty=False):
+    attributes = "".join(f' {name}="{escape_tsk_attribute(value)}"' for name, value in attributes)
+    f.write(f"{'  ' * depth}<{tag}{attributes}{'/' if empty else ''}>\n")
+
+# Write a waypoint (Point element) of the .tsk file, latitude and longitude in degrees
+def write_waypoint(f, point, latitude, longitude):
     point_type = point['type'].capitalize() if point['type'] != 'point' else 'Turn'
-    point_elem = SubElement(parent, 'Point', type=point_type)
-    wp_elem = SubElement(point_elem, 'Waypoint', altitude=str(point['elevation']), name=point['name'])
-    SubElement(wp_elem, 'Location', latitude=str(np.rad2deg(point['latitude'])), longitude=str(np.rad2deg(point['longitude'])))
-    
+    write_tsk_element(f, 1, 'Point', [('type', point_type)])
+    write_tsk_element(f, 2, 'Waypoint', [('altitude', point['elevation']), ('name', point['name'])])
+    write_tsk_element(f, 3, 'Location', [('latitude', latitude), ('longitude', longitude)], empty=True)
+    f.write("    </Waypoint>\n")
     if point_type == 'Start':
-        SubElement(point_elem, 'ObservationZone', length=str(2*point['oz_radius1']), type="Line")
+        write_tsk_element(f, 2, 'ObservationZone', [('length', 2*point['oz_radius1']), ('type', "Line")], empty=True)
     else:
-        SubElement(point_elem, 'ObservationZone', radius=str(point['oz_radius1']), type="Cylinder")
+        write_tsk_element(f, 2, 'ObservationZone', [('radius', point['oz_radius1']), ('type', "Cylinder")], empty=True)
+    f.write("  </Point>\n")
 
-# Create and save a task .tsk file from the fetched soaringspot .json data
-def create_task_tsk_file(json_data, class_name):
+# Compute the geometry (coordinates in degrees, distances) of the fetched soaringspot .json data
+def get_task_geometry(json_data):
+    return geometry_utils.task_geometry(json_data.get('task_points', []), aat=str(json_data.get('task_type')) == 'assigned_area')
+
+# Create and save a task .tsk file from the fetched soaringspot .json data (written element by element, no XML tree)
+def create_task_tsk_file(json_data, class_name, geometry=None):
     print(f"\t\t📄 Creating .tsk file")
-    if str(json_data['task_type']) == 'assigned_area':
-        task = Element('Task', aat_min_time=str(json_data['task_duration']), type='AAT')
+    points = json_data.get('task_points', [])
+    if geometry:
+        latitudes, longitudes = geometry['latitudes'], geometry['longitudes']
     else:
-        task = Element('Task', type='RT')
-
-    for point in json_data.get('task_points', []):
-        create_waypoint(task, point)
-            
-    # Instead of the above, use this:
-    rough_string = tostring(task, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-    pretty_xml = reparsed.toprettyxml(indent="  ")
-    pretty_xml_no_decl = '\n'.join(pretty_xml.split('\n')[1:])  # remove the first line
+        latitudes, longitudes = geometry_utils.degree_coordinates(points)
 
     # Save to file
     filename = config.filename_map.get(class_name, class_name)
     filepath = os.path.join(config.task_output_dir, f"{filename}.tsk")
     with open(filepath, "w", encoding='utf-8') as f:
-        f.write(pretty_xml_no_decl)
+        if str(json_data['task_type']) == 'assigned_area':
+            task_attributes = [('aat_min_time', json_data['task_duration']), ('type', 'AAT')]
+        else:
+            task_attributes = [('type', 'RT')]
+        write_tsk_element(f, 0, 'Task', task_attributes, empty=not points)
+        for point, latitude, longitude in zip(points, latitudes, longitudes):
+            write_waypoint(f, point, latitude, longitude)
+        if points:
+            f.write("</Task>\n")
     print(f"\t\t✅ Saved .tsk task file at '{filepath.replace(os.sep, '/')}'")
+    return filepath
    
-# Convert the original soaringspot .json data to a .json format that glideandseek expects
-def convert_soaringspot_json_to_glideandseek_json(json_data):
+# Convert the original soaringspot .json data to a .json format that glideandseek expects (plus the task distance)
+def convert_soaringspot_json_to_glideandseek_json(json_data, geometry=None):
     # Map task type
     task_type = "AAT" if str(json_data.get("task_type")) == "assigned_area" else "RT"
+    # Coordinates in degrees and distances of all points at once
+    geometry = geometry or get_task_geometry(json_data)
     points = []
-    for pt in json_data.get("task_points", []):
-        # Convert radians to degrees for lat/lng
-        lat = np.rad2deg(pt["latitude"])
-        lng = np.rad2deg(pt["longitude"])
+    for pt, lat, lng in zip(json_data.get("task_points", []), geometry['latitudes'], geometry['longitudes']):
         # Map type
         if pt["type"].lower() == "start":
             point_type = "Next"
@@ -166,59 +264,254 @@ def convert_soaringspot_json_to_glideandseek_json(json_data):
             "type": point_type,
             "name": pt["name"],
             "altitude": float(pt["elevation"]),
-            "lat": float(lat),
-            "lng": float(lng),
+            "lat": lat,
+            "lng": lng,
             "radius": int(pt["oz_radius1"])
         }
 
         points.append(point)
+    task_distance = {
+        "nominal_km": round(geometry['nominal'] / 1000, 2),
+        "legs_km": [round(leg / 1000, 2) for leg in geometry['legs']]
+    }
+    if geometry['min'] is not None:
+        task_distance["min_km"] = round(geometry['min'] / 1000, 2)
+        task_distance["max_km"] = round(geometry['max'] / 1000, 2)
     return {
         "type": task_type,
-        "points": points
+        "points": points,
+        "task_distance": task_distance
     }
 
 # Create and save a task .json file from the fetched data
-def create_task_json_file(soaringspot_json_data, class_name):
+def create_task_json_file(soaringspot_json_data, class_name, geometry=None):
+    print(f"\t\t📄 Creating .json file")
     filename = config.filename_map.get(class_name, class_name)
     filepath = os.path.join(config.task_output_dir, f"{filename}.json")
     
-    json_data = convert_soaringspot_json_to_glideandseek_json(soaringspot_json_data)
+    json_data = convert_soaringspot_json_to_glideandseek_json(soaringspot_json_data, geometry)
     if not json_data:
         print(f"\t❌ Failed to convert JSON data for {class_name}")
-        return
+        return None
     
     with open(filepath, "w", encoding='utf-8') as f:
         json.dump(json_data, f, indent=4)
     
     print(f"\t\t✅ Saved .json task file at '{filepath.replace(os.sep, '/')}'")
+    return filepath
+
+# Format a coordinate in degrees for the .cup file (DDMM.mmmN for latitudes, DDDMM.mmmE for longitudes)
+def format_cup_coordinate(value, degree_digits, positive, negative):
+    thousandths = round(abs(value) * 60000)
+    degrees, minutes = divmod(thousandths, 60000)
+    return f"{degrees:0{degree_digits}d}{minutes / 1000:06.3f}{positive if value >= 0 else negative}"
+
+# Format a number for the .cup file (whole numbers without decimals, e.g. 320m, 386.9m)
+def format_cup_number(value):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+# Quote a text field for the .cup file
+def quote_cup_text(text):
+    return '"' + str(text).replace('"', '""') + '"'
+
+# Date of the task: from the task ID (...-on-YYYY-MM-DD), else the taskData date if SoaringSpot provides one, else today
+def get_task_date(json_data, task_id=None):
+    match = re.search(r'-on-(\d{4}-\d{2}-\d{2})', task_id or '')
+    if match:
+        return match.group(1)
+    return str(json_data.get('task_date') or json_data.get('date') or datetime.date.today().isoformat())[:10]
 
-# Create a task .cup file from the fetched data (using the weglide URL which takes care of this task)
-def create_task_cup_file(class_name):
+# Build the SeeYou .cup content (waypoints, task and observation zones) from the fetched soaringspot .json data
+def build_task_cup(json_data, geometry=None, task_date=None):
+    points = json_data.get('task_points', [])
+    if geometry:
+        latitudes, longitudes = geometry['latitudes'], geometry['longitudes']
+    else:
+        latitudes, longitudes = geometry_utils.degree_coordinates(points)
+    task_date = task_date or get_task_date(json_data)
+
+    lines = ["name,code,country,lat,lon,elev,style,rwdir,rwlen,freq,desc"]
+    for point, latitude, longitude in zip(points, latitudes, longitudes):
+        lines.append(f'{quote_cup_text(point["name"])},"","", {format_cup_coordinate(latitude, 2, "N", "S")}, '
+                     f'{format_cup_coordinate(longitude, 3, "E", "W")}, {format_cup_number(point["elevation"])}m,1,,,,,""')
+    lines.append("-----Related Tasks-----")
+    lines.append(",".join([quote_cup_text(f"Task on {task_date}"), '""'] + [quote_cup_text(point["name"]) for point in points] + ['""']))
+
+    options = "Options"
+    if str(json_data.get('task_type')) == 'assigned_area' and json_data.get('task_duration'):
+        hours, rest = divmod(int(json_data['task_duration']), 3600)
+        options += f",TaskTime={hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+    lines.append(options)
+    for idx, point in enumerate(points):
+        radius = format_cup_number(point['oz_radius1'])
+        if point['type'] == 'start':
+            lines.append(f"ObsZone={idx},Style=2,R1={radius}m,A1=180,Line=1")
+        else:
+            lines.append(f"ObsZone={idx},Style=3,R1={radius}m,A1=180")
+    return "\n".join(lines)
+
+# Create and save a task .cup file from the fetched soaringspot .json data
+def create_task_cup_file(json_data, class_name, geometry=None):
+    print(f"\t\t📄 Creating .cup task file")
+    filename = config.filename_map.get(class_name, class_name)
+    filepath = os.path.join(config.task_output_dir, f"{filename}.cup")
+    # The task ID carries the task day, so the date is right even when an older task is selected (option 9)
+    cup_content = build_task_cup(json_data, geometry, get_task_date(json_data, config.selected_task_ids.get(class_name)))
+    with open(filepath, 'wb') as f:
+        f.write(cup_content.encode('utf-8'))
+    print(f"\t\t✅ Saved .cup task file at '{filepath.replace(os.sep, '/')}'")
+    return filepath
+
+# Download a task .cup file through the .cup converter (config.cup_url), used if the local .cup generation fails
+def download_task_cup_file(class_name):
     classURL = config.url_map.get(class_name, False)
     task_id = config.selected_task_ids[class_name]
     full_url = f"{config.cup_url}{config.base_url}/tasks/{classURL}/{task_id}"
-    print(f"\t\t📄 Creating .cup task file")
+    print(f"\t\t📄 Downloading .cup task file from the .cup converter")
 
-    response = requests.get(full_url)
+    try:
+        response = http_utils.get(full_url)
+    except requests.RequestException as e:
+        print(f"\t❌ Failed to download .cup task file ({e})")
+        return None
     if response.status_code == 200:
         filename = config.filename_map.get(class_name, class_name)
         filepath = os.path.join(config.task_output_dir, f"{filename}.cup")
         with open(filepath, 'wb') as f:
             f.write(response.content)
         print(f"\t\t✅ Saved .cup task file at '{filepath.replace(os.sep, '/')}'")
+        return filepath
     else:
         print(f"\t❌ Failed to download .cup task file (status code: {response.status_code})")
+        return None
 
-# Update task files for all classes
-def update_task_files():
-    print("⚙️  Updating task files...")
+# Version of the generated task files, stored in the manifest so files of an older version are regenerated (2: task distance in the .json)
+TASK_FILE_FORMAT = 2
+
+# Load the task manifest (task ID and taskData hash of the files last written for each class)
+def load_task_manifest():
+    if not os.path.exists(config.task_manifest_path):
+        return {}
+    try:
+        with open(config.task_manifest_path, "r", encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"\t❌ Could not read task manifest '{config.task_manifest_path}', regenerating all task files")
+        return {}
+
+# Save the task manifest
+def save_task_manifest(manifest):
+    with open(config.task_manifest_path, "w", encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+# Hash the extracted SoaringSpot taskData (key order does not matter)
+def hash_task_data(soaringspot_json_data):
+    return hashlib.sha256(json.dumps(soaringspot_json_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+# Check whether all task files of a class exist
+def task_files_exist(class_name):
+    filename = config.filename_map.get(class_name, class_name)
+    return all(os.path.exists(os.path.join(config.task_output_dir, f"{filename}.{ext}")) for ext in ('json', 'tsk', 'cup'))
+
+# Update the task files of a single class, returns the new manifest entry if all files were written
+# Every file that was written is added to written_paths (also when a later step fails)
+def update_class_task_files(class_name, manifest_entry, written_paths):
+    print(f"\t⚙️  Updating task files for class: {class_name}")
+    task_data = fetch_task_data(class_name)
+    if not task_data:
+        return None
+    soaringspot_json_data = extract_json_from_html(task_data)
+    if not soaringspot_json_data:
+        return None
+
+    task_entry = {'task_id': config.selected_task_ids[class_name], 'hash': hash_task_data(soaringspot_json_data), 'format': TASK_FILE_FORMAT}
+    if manifest_entry == task_entry and task_files_exist(class_name):
+        print(f"\t\tℹ️  Task unchanged, keeping existing .json/.tsk/.cup files")
+        return None
+
+    geometry = get_task_geometry(soaringspot_json_data)
+    print(f"\t\t📏 Task distance: {geometry_utils.format_task_distance(geometry)}")
+    written_paths.append(create_task_json_file(soaringspot_json_data, class_name, geometry))
+    written_paths.append(create_task_tsk_file(soaringspot_json_data, class_name, geometry))
+
+    # The .cup file is generated from the same data, the .cup converter is only a fallback
+    try:
+        cup_path = create_task_cup_file(soaringspot_json_data, class_name, geometry)
+    except Exception as e:
+        print(f"\t❌ Failed to create .cup task file: {e}")
+        cup_path = download_task_cup_file(class_name) if config.cup_converter_fallback else None
+    written_paths.append(cup_path)
+    # Without a .cup file the task is retried on the next update
+    return task_entry if cup_path else None
+
+# Find classes whose selected task was republished on SoaringSpot (same task ID, different taskData)
+# Returns the republished classes and the classes whose task files were never completely written (to be retried)
+# Task pages are requested conditionally, the pages of republished tasks are kept for update_task_files
+def detect_republished_classes():
+    manifest = load_task_manifest()
+    changed_classes = []
+    retry_classes = []
     for class_name in config.classes:
-        print(f"\t⚙️  Updating task files for class: {class_name}")
-        # Create task files for each class
-        task_data = fetch_task_data(class_name)
-        if task_data:
-            soaringspot_json_data = extract_json_from_html(task_data)
-            create_task_json_file(soaringspot_json_data, class_name)
-            create_task_tsk_file(soaringspot_json_data, class_name)
-            create_task_cup_file(class_name)
+        task_id = config.selected_task_ids.get(class_name)
+        classURL = config.url_map.get(class_name, False)
+        if not task_id or not classURL:
+            continue
+        manifest_entry = manifest.get(class_name)
+        # Files missing from the manifest were never completely written (page failed, no taskData, no .cup), so try again
+        if not manifest_entry or manifest_entry.get('task_id') != task_id:
+            retry_classes.append(class_name)
+            continue
+        # The validators are only kept while the page matches the written files, so "not modified" means unchanged
+        headers = {}
+        validators = config.task_page_validators.get(class_name, {})
+        if validators.get('task_id') == task_id and validators.get('hash') == manifest_entry.get('hash'):
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        url = f"{config.base_url}/tasks/{classURL}/{task_id}"
+        try:
+            response = http_utils.get(url, headers=headers)
+        except requests.RequestException:
+            continue
+        if response.status_code != 200:
+            continue
+        soaringspot_json_data = extract_json_from_html(response)
+        if not soaringspot_json_data:
+            continue
+        task_hash = hash_task_data(soaringspot_json_data)
+        if task_hash != manifest_entry.get('hash'):
+            changed_classes.append(class_name)
+            config.task_page_validators.pop(class_name, None)
+            config.task_page_cache[class_name] = (task_id, response)
+        else:
+            config.task_page_validators[class_name] = {'task_id': task_id, 'hash': task_hash,
+                                                       'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+    return changed_classes, retry_classes
 
+# Update task files for all classes, or only the given ones (classes are processed concurrently, output is printed in class order)
+# Returns the paths of all files that were written
+def update_task_files(class_names=None):
+    print("⚙️  Updating task files...")
+    start = time.perf_counter()
+    class_names = config.classes if class_names is None else class_names
+    manifest = load_task_manifest()
+    written_paths = []
+    workers = max(len(class_names), 1)
+    with ThreadPoolExecutor(max_workers=workers) as class_executor:
+        futures = [class_executor.submit(utils.run_with_buffered_output, update_class_task_files, class_name, manifest.get(class_name), written_paths) for class_name in class_names]
+        updated_entries = {}
+        for class_name, future in zip(class_names, futures):
+            output, task_entry, error = future.result()
+            print(output, end="")
+            if error:
+                print(f"\t❌ Updating task files for class {class_name} failed: {error}")
+            elif task_entry:
+                updated_entries[class_name] = task_entry
+    if updated_entries:
+        manifest.update(updated_entries)
+        save_task_manifest(manifest)
+        written_paths.append(config.task_manifest_path)
+    print(f"\tℹ️  HTTP session: {http_utils.format_http_stats()}")
+    print(f"\t✅ Task files updated in {time.perf_counter() - start:.1f} s ({len(updated_entries)} of {len(class_names)} class(es) regenerated)")
+    return [path for path in written_paths if path]
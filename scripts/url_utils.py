@@ -0,0 +1,102 @@
+# Import necessary libraries
+from scripts import config
+import os
+import re
+
+# Placeholders that can be used in the URL file
+CLASS_PLACEHOLDERS = ('taskID', 'classURL', 'classFile')
+GLOBAL_PLACEHOLDERS = ('gitHubPath',)
+placeholder_pattern = re.compile(r'\{([A-Za-z_]+)\}')
+
+# Compile a single URL into (is_placeholder, text) segments, returns None if it uses unknown or malformed placeholders
+def compile_url(url, line):
+    segments = []
+    position = 0
+    for match in placeholder_pattern.finditer(url):
+        name = match.group(1)
+        if name not in CLASS_PLACEHOLDERS and name not in GLOBAL_PLACEHOLDERS:
+            print(f"❌ URL '{line}' uses the unknown placeholder '{{{name}}}', skipping it.")
+            return None
+        if match.start() > position:
+            segments.append((False, url[position:match.start()]))
+        segments.append((True, name))
+        position = match.end()
+    if position < len(url):
+        segments.append((False, url[position:]))
+    # Braces left in the text are malformed placeholders (e.g. "{taskID/...", "{task ID}" or a stray "}")
+    if any(not is_placeholder and ('{' in text or '}' in text) for is_placeholder, text in segments):
+        print(f"❌ URL '{line}' has a malformed placeholder (stray '{{' or '}}'), skipping it.")
+        return None
+    return tuple(segments)
+
+# Parse the URL file into (window key, segments, uses class placeholders) entries
+def compile_url_file(url_file):
+    entries = []
+    with open(url_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            # No {WIN:} - default to window 0
+            win_key, url = 0, line
+            if line.startswith("{WIN:"):
+                win_part, _, url = line.partition("}")
+                win_key = win_part.replace("{WIN:", "")
+                url = url.strip()
+                if win_key != "I":
+                    if not win_key.isdigit():
+                        print(f"❌ URL '{line}' has an invalid window ID.")
+                        continue
+                    win_key = int(win_key)
+            segments = compile_url(url, line)
+            if segments is None:
+                continue
+            class_dependent = any(is_placeholder and text in CLASS_PLACEHOLDERS for is_placeholder, text in segments)
+            entries.append((win_key, segments, class_dependent))
+    return entries
+
+# Return the compiled URL file, only re-parsing it when its modification time changed
+def get_compiled_url_file(url_file):
+    mtime = os.stat(url_file).st_mtime_ns
+    cache = config.url_template_cache
+    if cache.get('path') != url_file or cache.get('mtime') != mtime:
+        cache['entries'] = compile_url_file(url_file)
+        cache['path'] = url_file
+        cache['mtime'] = mtime
+    return cache['entries']
+
+# Expand the URL file for all classes, returns {window key: [url1, url2, ...]} in order of appearance
+def expand_url_file(url_file):
+    global_values = {'gitHubPath': getattr(config, "github_path", "")}
+    # Placeholder values of every class that has all of them available
+    class_values = []
+    for class_name in config.classes:
+        values = {
+            **global_values,
+            'taskID': config.selected_task_ids.get(class_name, ""),
+            'classURL': config.url_map.get(class_name, ""),
+            'classFile': config.filename_map.get(class_name, ""),
+        }
+        if all(values[name] for name in CLASS_PLACEHOLDERS):
+            class_values.append((class_name, values))
+
+    win_urls = {}
+    for win_key, segments, class_dependent in get_compiled_url_file(url_file):
+        if not class_dependent:
+            url = "".join(global_values[text] if is_placeholder else text for is_placeholder, text in segments)
+            win_urls.setdefault(win_key, []).append(url)
+            continue
+        for class_name, values in class_values:
+            url = "".join(values[text] if is_placeholder else text for is_placeholder, text in segments)
+            # {WIN:I} - one window per class
+            key = f"I_{class_name}" if win_key == "I" else win_key
+            win_urls.setdefault(key, []).append(url)
+    return win_urls
+
+# Check if any URL of the URL file uses a class placeholder (these URLs are only opened for classes with a task ID)
+def url_file_uses_class_placeholders(url_file):
+    return any(class_dependent for _, _, class_dependent in get_compiled_url_file(url_file))
+
+# Check if any URL of the URL file uses a placeholder (task IDs, task and glider files on GitHub)
+def url_file_uses_placeholders(url_file):
+    return any(is_placeholder for _, segments, _ in get_compiled_url_file(url_file) for is_placeholder, _ in segments)
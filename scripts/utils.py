@@ -1,10 +1,9 @@
 # Import necessary libraries
-from scripts import task_utils
 from scripts import config
-from selenium.common.exceptions import NoSuchElementException
-from git import Repo, GitCommandError
+import threading
 import datetime
-import time
+import sys
+import io
 import os
 
 # Initialize things
@@ -15,38 +14,123 @@ def initialize():
     if not os.path.exists(config.glider_output_dir):
         os.makedirs(config.glider_output_dir)
 
-    # Load the latest task IDs for each class
-    config.selected_task_ids = task_utils.return_latest_task_ids_for_classes()
-
-# Function to wait for an element to be present in the DOM
-def wait_for_element(driver, by, value, timeout=30, poll_frequency=0.2):
-    end_time = time.time() + timeout
-    while True:
-        try:
-            element = driver.find_element(by, value)
-            time.sleep(0.5)
-            return element
-        except NoSuchElementException:
-            if time.time() > end_time:
-                break
-            time.sleep(poll_frequency)
+    # Load the latest task IDs for each class in the background, the menu shows "loading" until they arrive
+    global task_id_thread
+    config.task_id_status = {'state': 'loading', 'error': None}
+    task_id_thread = threading.Thread(target=load_task_ids, name="task-ids", daemon=True)
+    task_id_thread.start()
+
+# Background task ID discovery, started by initialize()
+task_id_thread = None
+
+# Load the latest task IDs (without blocking the menu)
+def load_task_ids():
+    from scripts import task_utils
+    output, task_ids, error = run_with_buffered_output(task_utils.return_latest_task_ids_for_classes)
+    if error:
+        config.task_id_status = {'state': 'failed', 'error': str(error)}
+    else:
+        # Task IDs selected by a menu action in the meantime are kept
+        if not config.selected_task_ids:
+            config.selected_task_ids = task_ids
+        config.task_id_status = {'state': 'loaded', 'error': None}
+
+# Look up the latest task IDs again (after the background lookup failed), returns the error or None
+def reload_task_ids():
+    from scripts import task_utils
+    output, task_ids, error = run_with_buffered_output(task_utils.return_latest_task_ids_for_classes)
+    if error:
+        config.task_id_status = {'state': 'failed', 'error': str(error)}
+        return error
+    config.selected_task_ids = task_ids
+    config.task_id_status = {'state': 'loaded', 'error': None}
     return None
 
-# Function to update and push task/glider files
-def commit_and_push_task_and_glider_files():
+# Wait for the background task ID discovery to finish (if it is still running), returns False on timeout
+def wait_for_task_ids(timeout=60):
+    if task_id_thread is not None and task_id_thread.is_alive():
+        print("⏳ Waiting for the task IDs to be loaded...")
+        task_id_thread.join(timeout)
+        return not task_id_thread.is_alive()
+    return True
+
+# Format the state of the task IDs for the menu (a failed lookup no longer counts once a menu action loaded the task IDs)
+def format_task_id_status():
+    status = config.task_id_status
+    if status['state'] == 'loading':
+        return "loading..."
+    if status['state'] == 'failed' and not config.selected_task_ids:
+        error = status['error'].splitlines()[0] if status['error'] else "unknown"
+        return f"could not be loaded, will be retried with the next update (error: {error[:80]}{'...' if len(error) > 80 else ''})"
+    return ", ".join(f"{class_name} {task_id}" for class_name, task_id in config.selected_task_ids.items()) or "none"
+
+# Per-thread output buffers, so concurrent workers can print without interleaving their lines
+thread_output = threading.local()
+
+# Stand-in for sys.stdout that sends writes to the current thread's buffer (if one is set)
+class ThreadOutputRouter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = getattr(thread_output, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+# Run a function while capturing everything it prints, returns (output, result, error)
+def run_with_buffered_output(func, *args, buffer=None):
+    if not isinstance(sys.stdout, ThreadOutputRouter):
+        sys.stdout = ThreadOutputRouter(sys.stdout)
+    buffer = buffer if buffer is not None else io.StringIO()
+    previous_buffer = getattr(thread_output, 'buffer', None)
+    thread_output.buffer = buffer
+    result, error = None, None
+    try:
+        result = func(*args)
+    except Exception as e:
+        error = e
+    finally:
+        thread_output.buffer = previous_buffer
+    return buffer.getvalue(), result, error
+
+# Write a text file atomically (write a temp file next to it, then rename it over the target)
+def write_file_atomic(filepath, content, encoding="utf-8"):
+    temp_path = f"{filepath}.tmp"
+    try:
+        with open(temp_path, "w", encoding=encoding) as f:
+            f.write(content)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# Function to wait for an element (by default until it is present in the DOM), returns None on timeout
+def wait_for_element(driver, by, value, timeout=30, poll_frequency=0.2, condition=None):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    condition = condition or EC.presence_of_element_located
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition((by, value)))
+    except TimeoutException:
+        return None
+
+# Function to wait for any condition function (driver -> truthy value), returns None on timeout
+def wait_for_condition(driver, condition, timeout=30, poll_frequency=0.2):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
     try:
-        repo = Repo(os.getcwd())
-        repo.git.add(["data/"])
-        if repo.is_dirty(index=True, working_tree=False, untracked_files=False):
-            print(f"⚙️  Committing/pushing task and glider files")
-            repo.index.commit("Update tasks and gliders")
-            origin = repo.remote(name='origin')
-            origin.push()
-            print("✅ Changes committed and pushed successfully.")
-        else:
-            print("ℹ️  No changes to commit.")
-    except GitCommandError as e:
-        print(f"❌ Commit or push failed: {e}")
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+    except TimeoutException:
+        return None
 
 # Function to print welcome message
 def print_welcome_message():
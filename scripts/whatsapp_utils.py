@@ -2,106 +2,270 @@
 from scripts import browser_utils
 from scripts import config
 from scripts import utils
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from difflib import SequenceMatcher
 import os
 import time
 
-# Function to send the latest weather briefing PDF to a WhatsApp group
-def send_pdf_to_whatsapp_group(pdf_path):
-    print(f"⚙️  Sending latest weather briefing to WhatsApp group '{config.whatsapp_group}'")
+# Record how long a step of the send took, returns the start time of the next step
+def record_step(step_times, step, start):
+    now = time.perf_counter()
+    step_times.append((step, now - start))
+    return now
+
+# Print the timing of all steps of a send
+def print_step_times(step_times):
+    total = sum(duration for _, duration in step_times)
+    steps = ", ".join(f"{step} {duration:.1f} s" for step, duration in step_times)
+    print(f"⏱️  WhatsApp timings: {steps} (total {total:.1f} s)")
+
+# In-page script returning [element, title] of every displayed chat title (one round trip for the whole list)
+CHAT_TITLES_SCRIPT = """
+const root = document.querySelector('#pane-side') || document;
+return Array.from(root.querySelectorAll('span[title]'))
+    .filter(span => span.offsetParent !== null)
+    .map(span => [span, span.getAttribute('title')]);
+"""
+
+# In-page script returning whether any of the given elements was removed from the page (the list was re-rendered)
+ANY_DETACHED_SCRIPT = "return arguments[0].some(element => !element.isConnected);"
+
+# Displayed chats as (element, title) pairs
+def displayed_chats(driver):
+    return [(span, title) for span, title in driver.execute_script(CHAT_TITLES_SCRIPT) or [] if title]
+
+# Check whether any of the given chat elements was removed from the page
+def chats_rerendered(driver, spans):
+    if not spans:
+        return False
     try:
-        # Should only ever be None
-        if config.whatsapp_driver == None:
-            config.whatsapp_driver = browser_utils.open_browser(userData=True, runHeadless=False, whatsAppBrowser=True)
-            first_tab = True
-        else:
-            first_tab = False
+        return bool(driver.execute_script(ANY_DETACHED_SCRIPT, spans))
+    except StaleElementReferenceException:
+        return True
 
-        url = "https://web.whatsapp.com/"
-        browser_utils.open_tab(config.whatsapp_driver, url, first_tab)
-        # Switch to the newest tab
-        config.whatsapp_driver.switch_to.window(config.whatsapp_driver.window_handles[-1])
+# Condition: the displayed chat titles are the same as on the previous check (WhatsApp finished updating the list), returns (chats,)
+def chat_list_settled():
+    previous_titles = []
+    def condition(driver):
+        chats = displayed_chats(driver)
+        titles = [title for _, title in chats]
+        settled = bool(previous_titles) and titles == previous_titles[-1]
+        previous_titles.append(titles)
+        return (chats,) if settled else False
+    return condition
 
-        # Wait for WhatsApp Web to load (minimized sleep, responsive)
-        search_box = utils.wait_for_element(config.whatsapp_driver, By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]', timeout=config.whatsapp_timeout, poll_frequency=0.2)
-        if not search_box:
-            print("❌ WhatsApp Web did not load properly. Please check your internet connection and try again.")
-            if first_tab:
-                browser_utils.close_whatsapp_driver()
-            return
+# Condition: the chat list shows the search results, i.e. it changed or was re-rendered since chats_before
+# (the list before the search text was typed) and has settled, returns (chats,)
+def search_results_shown(chats_before):
+    titles_before = [title for _, title in chats_before]
+    spans_before = [span for span, _ in chats_before]
+    settled = chat_list_settled()
+    def condition(driver):
+        result = settled(driver)
+        if not result:
+            return False
+        if [title for _, title in result[0]] != titles_before or chats_rerendered(driver, spans_before):
+            return result
+        return False
+    return condition
+
+# Normalize a chat title for matching (emojis and punctuation dropped, case-insensitive)
+def normalize_chat_title(title):
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in title.lower()).split())
+
+# Score how well a chat title matches the group name (exact > prefix > contained > similar)
+def score_chat_title(group_name, title):
+    query, candidate = normalize_chat_title(group_name), normalize_chat_title(title)
+    if not query or not candidate:
+        return 0.0
+    similarity = SequenceMatcher(None, query, candidate).ratio()
+    if candidate == query:
+        return 3.0
+    if candidate.startswith(query):
+        return 2.0 + similarity
+    if query in candidate:
+        return 1.0 + similarity
+    return similarity
+
+# Return the best matching chat title (or None if nothing matches well enough)
+def best_chat_title(group_name, titles):
+    ranked = sorted(((score_chat_title(group_name, title), title) for title in set(titles)), reverse=True)
+    if ranked and ranked[0][0] >= config.whatsapp_group_min_score:
+        return ranked[0][1]
+    return None
 
+# Title of the chat matching the group among the search results (exactly the given title, or the best match)
+def match_chat_title(group_name, titles, exact_title=None):
+    if exact_title:
+        return exact_title if exact_title in titles else None
+    return best_chat_title(group_name, titles)
+
+# Condition: click the displayed chat with the given title, found again right before the click
+# (the list may be re-rendered at any time, which leaves earlier elements stale)
+def click_chat(title):
+    def condition(driver):
+        for span, span_title in displayed_chats(driver):
+            if span_title == title:
+                try:
+                    span.click()
+                    return True
+                except StaleElementReferenceException:
+                    return False
+        return False
+    return condition
+
+# Search the chat list for a group and open it, returns False if it could not be found
+def open_group_chat(driver, search_box, group_name):
+    # The chat title resolved on an earlier send is searched for and matched exactly
+    # (ChromeDriver cannot type characters outside the BMP, so emojis are left out of the search text)
+    cached_title = config.whatsapp_chat_cache.get(group_name)
+    cached_search_text = "".join(ch for ch in cached_title if ord(ch) <= 0xFFFF).strip() if cached_title else None
+    for search_text, exact_title in ((cached_search_text, cached_title), (group_name, None)):
+        if not search_text:
+            continue
         search_box.click()
-        time.sleep(0.2)
         try:
             search_box.clear()
         except Exception:
             # fallback if clear() is not supported
             search_box.send_keys(Keys.BACKSPACE * 30)
-        search_box.send_keys(config.whatsapp_group)
-        # Wait for chats to load
-        time.sleep(1)
-
-        # Re-find all chat titles after the DOM update
-        chat_spans = config.whatsapp_driver.find_elements(By.XPATH, '//span[@title]')
-        group = None
-        for span in chat_spans:
-            try:
-                title = span.get_attribute("title")
-                if config.whatsapp_group in title and span.is_displayed():
-                    group = span
-                    break
-            except Exception:
-                continue
-        if not group:
-            print(f"❌ Could not find WhatsApp group containing '{config.whatsapp_group}'.")
-            if first_tab:
-                browser_utils.close_whatsapp_driver()
-            return
-        group.click()
+        # The list before the search (once it stopped changing after the clear) tells when the search results are shown
+        settled = utils.wait_for_condition(driver, chat_list_settled(), timeout=config.whatsapp_timeout)
+        chats_before = settled[0] if settled else displayed_chats(driver)
+        search_box.send_keys(search_text)
 
-        # Attach file
-        attach_btn = utils.wait_for_element(config.whatsapp_driver, By.CSS_SELECTOR, "span[data-icon='plus-rounded']", timeout=config.whatsapp_timeout, poll_frequency=0.2)
-        if not attach_btn:
-            print("❌ Could not find attach button.")
-            if first_tab:
-                browser_utils.close_whatsapp_driver()
-            return
-        attach_btn.click()
+        # Wait until the chat list shows the search results, only these are matched against the group
+        # (the recent chats shown before may list a similar group, e.g. "Junioren EM Crew" for "Junioren EM")
+        results = utils.wait_for_condition(driver, search_results_shown(chats_before), timeout=config.whatsapp_timeout)
+        if not results:
+            continue
+        title = match_chat_title(group_name, [title for _, title in results[0]], exact_title)
+        if title and utils.wait_for_condition(driver, click_chat(title), timeout=config.whatsapp_timeout):
+            config.whatsapp_chat_cache[group_name] = title
+            return True
+    # The cached chat does not exist anymore (e.g. renamed group)
+    config.whatsapp_chat_cache.pop(group_name, None)
+    return False
 
-        file_input = utils.wait_for_element(config.whatsapp_driver, By.CSS_SELECTOR, "input[type='file']", timeout=config.whatsapp_timeout, poll_frequency=0.2)
-        if not file_input:
-            print("❌ Could not find file input.")
-            if first_tab:
-                browser_utils.close_whatsapp_driver()
-            return
-        file_input.send_keys(os.path.abspath(pdf_path))
+# Count the outgoing messages in the open chat
+def count_outgoing_messages(driver):
+    return len(driver.find_elements(By.CSS_SELECTOR, "div.message-out"))
+
+# Condition: a new outgoing message exists and shows as sent (single or double check mark instead of the clock)
+def message_sent(sent_before):
+    def condition(driver):
+        outgoing = driver.find_elements(By.CSS_SELECTOR, "div.message-out")
+        if len(outgoing) <= sent_before:
+            return False
+        return bool(outgoing[-1].find_elements(By.CSS_SELECTOR, "span[data-icon='msg-check'], span[data-icon='msg-dblcheck']"))
+    return condition
+
+# Wait until WhatsApp Web has loaded and the search box can be used
+def wait_for_search_box(driver):
+    return utils.wait_for_element(driver, By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]', timeout=config.whatsapp_timeout, condition=EC.element_to_be_clickable)
+
+# Send the PDF with a caption to one group in the already open WhatsApp Web tab, returns an error message or None
+def send_pdf_to_chat(driver, pdf_path, group_name, caption, step_times):
+    step_start = time.perf_counter()
+    search_box = wait_for_search_box(driver)
+    if not search_box:
+        return "WhatsApp Web search box not available"
+    if not open_group_chat(driver, search_box, group_name):
+        return f"could not find a WhatsApp group matching '{group_name}'"
+    step_start = record_step(step_times, "search", step_start)
+
+    # Attach file
+    attach_btn = utils.wait_for_element(driver, By.CSS_SELECTOR, "span[data-icon='plus-rounded']", timeout=config.whatsapp_timeout, condition=EC.element_to_be_clickable)
+    if not attach_btn:
+        return "could not find attach button"
+    sent_before = count_outgoing_messages(driver)
+    attach_btn.click()
+
+    file_input = utils.wait_for_element(driver, By.CSS_SELECTOR, "input[type='file']", timeout=config.whatsapp_timeout)
+    if not file_input:
+        return "could not find file input"
+    file_input.send_keys(os.path.abspath(pdf_path))
+
+    # Message input (caption), clickable once the file preview is ready
+    msg_box = utils.wait_for_element(driver, By.XPATH, '//div[@contenteditable="true"][@aria-placeholder="Add a caption"]', timeout=config.whatsapp_timeout, condition=EC.element_to_be_clickable)
+    if not msg_box:
+        return "could not find message input box"
+    step_start = record_step(step_times, "attach", step_start)
+    msg_box.click()
+    msg_box.send_keys(caption)
+    msg_box.send_keys(u'\ue007')  # Press Enter
+
+    # Wait until the upload is done and the message shows as sent
+    sent = utils.wait_for_condition(driver, message_sent(sent_before), timeout=config.whatsapp_send_timeout)
+    record_step(step_times, "upload", step_start)
+    if not sent:
+        return f"message did not show as sent within {config.whatsapp_send_timeout} s"
+    return None
 
-        # Message input (caption)
-        msg_box = utils.wait_for_element(config.whatsapp_driver, By.XPATH, '//div[@contenteditable="true"][@aria-placeholder="Add a caption"]', timeout=config.whatsapp_timeout, poll_frequency=0.2)
-        if not msg_box:
-            print("❌ Could not find message input box.")
+# Function to send the latest weather briefing PDF to the WhatsApp groups (all in one WhatsApp Web session)
+# groups is a list of {'group': name, 'message': caption}, by default config.whatsapp_groups
+def send_pdf_to_whatsapp_group(pdf_path, groups=None):
+    groups = config.whatsapp_groups if groups is None else groups
+    group_names = ", ".join(f"'{group['group']}'" for group in groups)
+    print(f"⚙️  Sending latest weather briefing to WhatsApp group(s) {group_names}")
+    step_times = []
+    step_start = time.perf_counter()
+    first_tab = False
+    try:
+        # Should only ever be None
+        if config.whatsapp_driver == None:
+            config.whatsapp_driver = browser_utils.acquire_driver("whatsapp", userData=True, runHeadless=False, whatsAppBrowser=True)
+            first_tab = True
+        step_start = record_step(step_times, "browser", step_start)
+
+        url = "https://web.whatsapp.com/"
+        browser_utils.open_tab(config.whatsapp_driver, url, first_tab)
+        # Switch to the newest tab
+        config.whatsapp_driver.switch_to.window(config.whatsapp_driver.window_handles[-1])
+
+        if not wait_for_search_box(config.whatsapp_driver):
+            print("❌ WhatsApp Web did not load properly. Please check your internet connection and try again.")
             if first_tab:
                 browser_utils.close_whatsapp_driver()
             return
-        msg_box.click()
-        msg_box.send_keys(config.whatsapp_message)
-        msg_box.send_keys(u'\ue007')  # Press Enter
+        record_step(step_times, "load", step_start)
+        print_step_times(step_times)
+
+        # Send to every group in the same session
+        outcomes = []
+        for group in groups:
+            group_step_times = []
+            try:
+                error = send_pdf_to_chat(config.whatsapp_driver, pdf_path, group['group'], group.get('message', config.whatsapp_message), group_step_times)
+            except Exception as e:
+                error = str(e)
+            outcomes.append((group['group'], error))
+            if error:
+                print(f"\t❌ '{group['group']}': {error}")
+            else:
+                print(f"\t✅ '{group['group']}': PDF sent")
+            print("\t", end="")
+            print_step_times(group_step_times)
 
-        # Wait for the message to be sent
-        time.sleep(config.whatsapp_group_send_time)  # Wait for a few seconds to ensure the message is sent
-        if not first_tab:
+        # Messages that were not confirmed may still be uploading, so keep WhatsApp open for them
+        if any(error and "did not show as sent" in error for _, error in outcomes):
+            print("❌ Not all messages showed as sent. Leaving WhatsApp open so the uploads can finish.")
+        elif not first_tab:
             config.whatsapp_driver.close()
             # Switch back to the last remaining tab (if any)
             if config.whatsapp_driver.window_handles:
                 config.whatsapp_driver.switch_to.window(config.whatsapp_driver.window_handles[-1])
         else:
             browser_utils.close_whatsapp_driver()
-        print("✅ PDF sent to WhatsApp group.")
+        sent = sum(1 for _, error in outcomes if not error)
+        print(f"{'✅' if sent == len(outcomes) else '❌'} PDF sent to {sent} of {len(outcomes)} WhatsApp group(s).")
     except Exception as e:
         print(f"❌ Error sending PDF to WhatsApp group. Please check if the group name is correct and you are logged in to WhatsApp Web. Error: {e}")
         try:
             if first_tab:
                 browser_utils.close_whatsapp_driver()
         except:
-            print("❌ Failed to close the browser config.whatsapp_driver. Something really went wrong.")
\ No newline at end of file
+            print("❌ Failed to close the browser config.whatsapp_driver. Something really went wrong.")